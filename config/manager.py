@@ -1,15 +1,22 @@
 # config/manager.py
 # This module handles loading and saving application settings from a JSON file.
 
-import json
 import os
+import json
 import logging
+from pathlib import Path
+
+from core._json import loads, JSONDecodeError
+from core._deferred_save import DeferredSave
 
 logger = logging.getLogger(__name__)
 
 class ConfigManager:
     """Manages application configuration settings."""
 
+    # Seconds to wait for further changes before writing the file
+    FLUSH_DELAY = 0.5
+
     def __init__(self, config_path='config.json'):
         """
         Initializes the ConfigManager.
@@ -18,7 +25,19 @@ class ConfigManager:
             config_path (str): The path to the configuration file.
         """
         self.config_path = config_path
-        self.settings = self.load_settings()
+        self._settings = None
+        self._pending_save = DeferredSave(self.save_settings, self.FLUSH_DELAY)
+
+    @property
+    def settings(self):
+        """The settings dictionary, loaded from disk on first access."""
+        if self._settings is None:
+            self._settings = self.load_settings()
+        return self._settings
+
+    @settings.setter
+    def settings(self, value):
+        self._settings = value
 
     def get_default_settings(self):
         """Returns a dictionary with default settings."""
@@ -27,7 +46,7 @@ class ConfigManager:
             "max_concurrent_downloads": 4,
             "max_concurrent_listings": 4,
             "listing_depth": 3,
-            "chunk_size": 8192,
+            "chunk_size": 262144,
             "request_timeout": 30,
             "retry_attempts": 3,
             "retry_delay": 5,
@@ -41,17 +60,16 @@ class ConfigManager:
         """
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    settings = json.load(f)
-                    # Ensure all default keys are present
-                    default_settings = self.get_default_settings()
-                    for key, value in default_settings.items():
-                        settings.setdefault(key, value)
-                    return settings
+                settings = loads(Path(self.config_path).read_bytes())
+                # Ensure all default keys are present
+                default_settings = self.get_default_settings()
+                for key, value in default_settings.items():
+                    settings.setdefault(key, value)
+                return settings
             else:
                 logger.info(f"Configuration file not found at {self.config_path}. Creating with default settings.")
                 return self.create_default_config()
-        except (json.JSONDecodeError, IOError) as e:
+        except (JSONDecodeError, IOError) as e:
             logger.error(f"Error loading configuration: {e}. Using default settings.")
             return self.get_default_settings()
 
@@ -69,8 +87,8 @@ class ConfigManager:
             settings = self.settings
             
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(settings, f, indent=4)
+            # Same 4-space layout as the shipped config.json, so saving doesn't reformat the whole file
+            Path(self.config_path).write_text(json.dumps(settings, indent=4))
             logger.info(f"Settings saved to {self.config_path}")
         except IOError as e:
             logger.error(f"Error saving configuration: {e}")
@@ -80,6 +98,10 @@ class ConfigManager:
         return self.settings.get(key, default)
 
     def set(self, key, value):
-        """Sets a setting value and saves it."""
+        """Sets a setting value and schedules a save."""
         self.settings[key] = value
-        self.save_settings()
+        self._pending_save.mark_dirty()
+
+    def flush(self):
+        """Writes pending setting changes to disk, if there are any."""
+        self._pending_save.flush()
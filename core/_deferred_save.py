@@ -0,0 +1,36 @@
+# core/_deferred_save.py
+# Coalesces bursts of changes to a small file into one write shortly after the last change.
+
+import atexit
+import threading
+
+class DeferredSave:
+    """Calls save once changes stop arriving for delay seconds, and at exit if any are pending."""
+
+    def __init__(self, save, delay=0.5):
+        self._save = save
+        self.delay = delay
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def mark_dirty(self):
+        """Record a change and restart the timer that coalesces pending changes into one save."""
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                # First pending write: make sure it is not lost on exit
+                atexit.register(self.flush)
+            else:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Save now if there are pending changes."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+        self._save()
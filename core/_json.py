@@ -0,0 +1,24 @@
+# core/_json.py
+# Small JSON shim that uses orjson when it is available and falls back to the stdlib.
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can catch either.
+JSONDecodeError = orjson.JSONDecodeError if orjson else json.JSONDecodeError
+
+def loads(data):
+    """Deserialize JSON from bytes or str."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj):
+    """Serialize obj to compact UTF-8 encoded JSON bytes."""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
@@ -1,69 +1,24 @@
 # core/bookmark_manager.py
 # Bookmark management system for FTP servers
 
-import json
 import os
+import json
 import logging
+from pathlib import Path
+
+from ._json import loads
+from ._deferred_save import DeferredSave
 
 logger = logging.getLogger(__name__)
 
 class BookmarkManager:
     """Manages server bookmarks and categories for quick navigation."""
     
-    def __init__(self, servers_file="servers.json"):
-        self.servers_file = servers_file
-        self.servers = {}
-        self.load_bookmarks()
-    
-    def load_bookmarks(self):
-        """Load bookmarks from the servers.json file."""
-        try:
-            if os.path.exists(self.servers_file):
-                with open(self.servers_file, 'r', encoding='utf-8') as f:
-                    self.servers = json.load(f)
-            else:
-                logger.warning(f"Servers file {self.servers_file} not found. Using empty bookmarks.")
-                self.servers = {"CircleFTP": {}, "Dhakaflix": {}}
-        except Exception as e:
-            logger.error(f"Error loading bookmarks: {e}")
-            self.servers = {"CircleFTP": {}, "Dhakaflix": {}}
-    
-    def get_servers(self):
-        """Get list of available servers."""
-        return list(self.servers.keys())
-    
-    def get_categories(self, server_name):
-        """Get categories for a specific server."""
-        return list(self.servers.get(server_name, {}).keys())
-    
-    def get_url(self, server_name, category_name):
-        """Get URL for a specific server and category."""
-        return self.servers.get(server_name, {}).get(category_name, "")
-    
-    def add_bookmark(self, server_name, category_name, url):
-        """Add a new bookmark."""
-        if server_name not in self.servers:
-            self.servers[server_name] = {}
-        self.servers[server_name][category_name] = url
-        self.save_bookmarks()
-    
-    def remove_bookmark(self, server_name, category_name):
-        """Remove a bookmark."""
-        if server_name in self.servers and category_name in self.servers[server_name]:
-            del self.servers[server_name][category_name]
-            self.save_bookmarks()
-    
-    def save_bookmarks(self):
-        """Save bookmarks to the servers.json file."""
-        try:
-            with open(self.servers_file, 'w', encoding='utf-8') as f:
-                json.dump(self.servers, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"Error saving bookmarks: {e}")
+    # Seconds to wait for further changes before writing the file
+    FLUSH_DELAY = 0.5
     
-    def generate_bookmarks_html(self):
-        """Generate HTML content for the bookmark homepage."""
-        html = """
+    # Static document head and stylesheet for the bookmark homepage
+    _HEAD_HTML = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -129,29 +84,121 @@ class BookmarkManager:
         <body>
             <h1>🚀 FTP Server Bookmarks</h1>
         """
+    
+    def __init__(self, servers_file="servers.json"):
+        self.servers_file = servers_file
+        self._servers = None
+        self._html_cache = None
+        self._flat_cache = None
+        self._servers_cache = None
+        self._categories_cache = {}
+        self._pending_save = DeferredSave(self.save_bookmarks, self.FLUSH_DELAY)
+    
+    @property
+    def servers(self):
+        """The server -> {category: url} mapping, loaded on first access."""
+        if self._servers is None:
+            self.load_bookmarks()
+        return self._servers
+    
+    @servers.setter
+    def servers(self, value):
+        self._servers = value
+    
+    def load_bookmarks(self):
+        """Load bookmarks from the servers.json file."""
+        self._invalidate_caches()
+        try:
+            if os.path.exists(self.servers_file):
+                self.servers = loads(Path(self.servers_file).read_bytes())
+            else:
+                logger.warning(f"Servers file {self.servers_file} not found. Using empty bookmarks.")
+                self.servers = {"CircleFTP": {}, "Dhakaflix": {}}
+        except Exception as e:
+            logger.error(f"Error loading bookmarks: {e}")
+            self.servers = {"CircleFTP": {}, "Dhakaflix": {}}
+    
+    def _invalidate_caches(self):
+        """Drop the lists and HTML derived from the bookmarks after they change."""
+        self._html_cache = None
+        self._flat_cache = None
+        self._servers_cache = None
+        self._categories_cache = {}
+    
+    def get_servers(self):
+        """Get list of available servers."""
+        if self._servers_cache is None:
+            self._servers_cache = list(self.servers.keys())
+        return self._servers_cache
+    
+    def get_categories(self, server_name):
+        """Get categories for a specific server."""
+        categories = self._categories_cache.get(server_name)
+        if categories is None:
+            categories = self._categories_cache[server_name] = list(self.servers.get(server_name, {}).keys())
+        return categories
+    
+    def get_url(self, server_name, category_name):
+        """Get URL for a specific server and category."""
+        return self.servers.get(server_name, {}).get(category_name, "")
+    
+    def get_bookmarks(self):
+        """Get every bookmark as a flat list of (server, category, url) tuples."""
+        if self._flat_cache is None:
+            self._flat_cache = [(server, category, url)
+                                for server, categories in self.servers.items()
+                                for category, url in categories.items()]
+        return self._flat_cache
+    
+    def add_bookmark(self, server_name, category_name, url):
+        """Add a new bookmark."""
+        if server_name not in self.servers:
+            self.servers[server_name] = {}
+        self.servers[server_name][category_name] = url
+        self._invalidate_caches()
+        self._pending_save.mark_dirty()
+    
+    def remove_bookmark(self, server_name, category_name):
+        """Remove a bookmark."""
+        if server_name in self.servers and category_name in self.servers[server_name]:
+            del self.servers[server_name][category_name]
+            self._invalidate_caches()
+            self._pending_save.mark_dirty()
+    
+    def flush(self):
+        """Write pending bookmark changes to disk, if there are any."""
+        self._pending_save.flush()
+    
+    def save_bookmarks(self):
+        """Save bookmarks to the servers.json file."""
+        try:
+            # servers.json is kept in its original 2-space, unescaped form for hand editing
+            Path(self.servers_file).write_text(json.dumps(self.servers, indent=2, ensure_ascii=False), encoding='utf-8')
+        except Exception as e:
+            logger.error(f"Error saving bookmarks: {e}")
+    
+    def generate_bookmarks_html(self):
+        """Generate HTML content for the bookmark homepage."""
+        if self._html_cache is not None:
+            return self._html_cache
         
+        parts = [self._HEAD_HTML]
         total_categories = 0
-        for server in self.get_servers():
-            categories = self.get_categories(server)
+        for server, categories in self.servers.items():
             total_categories += len(categories)
-            
-            html += f'<div class="server-section">'
-            html += f'<h2 class="server-name">📁 {server}</h2>'
-            html += '<ul class="category-list">'
-            
-            for category in categories:
-                url = self.get_url(server, category)
-                html += f'<li class="category-item">'
-                html += f'<a href="{url}" class="category-link">📂 {category}</a>'
-                html += f'</li>'
-            
-            html += '</ul></div>'
+            parts.append(f'<div class="server-section"><h2 class="server-name">📁 {server}</h2><ul class="category-list">')
+            parts.extend(
+                f'<li class="category-item"><a href="{url}" class="category-link">📂 {category}</a></li>'
+                for category, url in categories.items()
+            )
+            parts.append('</ul></div>')
         
-        html += f"""
+        parts.append(f"""
             <div class="stats">
-                Total Servers: {len(self.get_servers())} | Total Categories: {total_categories}
+                Total Servers: {len(self.servers)} | Total Categories: {total_categories}
             </div>
         </body>
         </html>
-        """
-        return html
+        """)
+        self._html_cache = ''.join(parts)
+        return self._html_cache
@@ -2,95 +2,159 @@
 # Directory cache management for optimization
 
 import os
-import json
+import time
 import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from datetime import datetime, timedelta
 
+from ._json import loads, dumps
+
 logger = logging.getLogger(__name__)
 
+class MemoryCache:
+    """A thread-safe in-process LRU cache whose entries expire after ttl seconds."""
+    
+    def __init__(self, maxsize=256, ttl=24 * 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._lock = threading.RLock()
+    
+    def get(self, key):
+        """Return the cached value, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
 class DirectoryCache:
     """Manages caching of directory listings to improve performance."""
     
-    def __init__(self, cache_dir="cache"):
+    def __init__(self, cache_dir="cache", time_source=None, cache_duration=timedelta(hours=24)):
         self.cache_dir = cache_dir
-        self.cache_duration = timedelta(hours=24)  # 24 hour cache expiration
+        self.cache_duration = cache_duration  # 24 hour cache expiration by default
+        # Wall-clock seconds, compared against file mtimes; injectable so tests can move time
+        self._now = time_source or time.time
         os.makedirs(cache_dir, exist_ok=True)
     
     def _get_cache_key(self, url):
         """Generate a safe cache key from URL."""
-        # Use hash to create a safe filename
-        url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
+        # Use hash to create a safe filename; blake2b is faster than md5 and this isn't security sensitive
+        url_hash = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
         return f"cache_{url_hash}.json"
     
+    def _is_expired(self, mtime, now):
+        """Check whether a cache file's modification time is past the cache duration."""
+        return now - mtime >= self.cache_duration.total_seconds()
+    
     def get(self, url):
         """Get cached directory listing if available and not expired."""
         try:
             cache_file = os.path.join(self.cache_dir, self._get_cache_key(url))
             
-            if not os.path.exists(cache_file):
+            try:
+                st = os.stat(cache_file)
+            except FileNotFoundError:
                 return None
             
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Check if cache is still valid
-            cache_time = datetime.fromisoformat(data['timestamp'])
-            if datetime.now() - cache_time < self.cache_duration:
-                logger.info(f"Cache hit for URL: {url}")
-                return data['content']
-            else:
-                # Cache expired, remove it
+            # The file mtime is the cache timestamp, so stale entries are dropped unparsed
+            if self._is_expired(st.st_mtime, self._now()):
                 os.remove(cache_file)
                 logger.info(f"Cache expired for URL: {url}")
                 return None
+            
+            data = loads(Path(cache_file).read_bytes())
+            
+            logger.info(f"Cache hit for URL: {url}")
+            return data['content']
                 
         except Exception as e:
             logger.error(f"Error reading cache for {url}: {e}")
             return None
     
-    def set(self, url, content):
-        """Cache directory listing with timestamp."""
+    def get_entry(self, url):
+        """Get the stored entry for a URL, expired or not, so it can be revalidated with the server."""
+        try:
+            return loads(Path(os.path.join(self.cache_dir, self._get_cache_key(url))).read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading cache for {url}: {e}")
+            return None
+    
+    def touch(self, url):
+        """Restart a cached entry's expiry clock, e.g. after the server confirmed it is unchanged."""
+        try:
+            now = self._now()
+            os.utime(os.path.join(self.cache_dir, self._get_cache_key(url)), (now, now))
+        except OSError as e:
+            logger.error(f"Error touching cache for {url}: {e}")
+    
+    def set(self, url, content, etag=None, last_modified=None):
+        """Cache directory listing with timestamp and, if given, the server's validators."""
         try:
             cache_file = os.path.join(self.cache_dir, self._get_cache_key(url))
             
+            now = self._now()
             data = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': datetime.fromtimestamp(now).isoformat(),
                 'url': url,
                 'content': content
             }
+            if etag:
+                data['etag'] = etag
+            if last_modified:
+                data['last_modified'] = last_modified
             
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Cache files are only read back by us, so skip pretty-printing
+            Path(cache_file).write_bytes(dumps(data))
+            # Stamp the file so expiry checks only need a stat()
+            os.utime(cache_file, (now, now))
             
             logger.info(f"Cached directory listing for URL: {url}")
             
         except Exception as e:
             logger.error(f"Error caching directory listing for {url}: {e}")
     
+    def _scan_cache_files(self):
+        """Yield a DirEntry for every cache file in the cache directory."""
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.startswith('cache_') and entry.name.endswith('.json'):
+                    yield entry
+    
     def clear_expired(self):
         """Remove all expired cache files."""
         try:
             removed_count = 0
-            for filename in os.listdir(self.cache_dir):
-                if filename.startswith('cache_') and filename.endswith('.json'):
-                    cache_file = os.path.join(self.cache_dir, filename)
-                    try:
-                        with open(cache_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        
-                        cache_time = datetime.fromisoformat(data['timestamp'])
-                        if datetime.now() - cache_time >= self.cache_duration:
-                            os.remove(cache_file)
-                            removed_count += 1
-                    except Exception as e:
-                        logger.error(f"Error processing cache file {filename}: {e}")
-                        # Remove corrupted cache files
-                        try:
-                            os.remove(cache_file)
-                            removed_count += 1
-                        except:
-                            pass
+            now = self._now()
+            for entry in self._scan_cache_files():
+                try:
+                    if self._is_expired(entry.stat().st_mtime, now):
+                        os.remove(entry.path)
+                        removed_count += 1
+                except Exception as e:
+                    logger.error(f"Error processing cache file {entry.name}: {e}")
             
             if removed_count > 0:
                 logger.info(f"Removed {removed_count} expired cache files")
@@ -102,14 +166,12 @@ class DirectoryCache:
         """Remove all cache files."""
         try:
             removed_count = 0
-            for filename in os.listdir(self.cache_dir):
-                if filename.startswith('cache_') and filename.endswith('.json'):
-                    cache_file = os.path.join(self.cache_dir, filename)
-                    try:
-                        os.remove(cache_file)
-                        removed_count += 1
-                    except Exception as e:
-                        logger.error(f"Error removing cache file {filename}: {e}")
+            for entry in self._scan_cache_files():
+                try:
+                    os.remove(entry.path)
+                    removed_count += 1
+                except Exception as e:
+                    logger.error(f"Error removing cache file {entry.name}: {e}")
             
             logger.info(f"Removed all {removed_count} cache files")
             
@@ -119,25 +181,19 @@ class DirectoryCache:
     def get_cache_stats(self):
         """Get statistics about the cache."""
         try:
-            cache_files = [f for f in os.listdir(self.cache_dir) 
-                          if f.startswith('cache_') and f.endswith('.json')]
-            
-            total_files = len(cache_files)
+            total_files = 0
             total_size = 0
             valid_files = 0
             expired_files = 0
             
-            for filename in cache_files:
-                cache_file = os.path.join(self.cache_dir, filename)
+            now = self._now()
+            for entry in self._scan_cache_files():
+                total_files += 1
                 try:
-                    file_size = os.path.getsize(cache_file)
-                    total_size += file_size
-                    
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    st = entry.stat()
+                    total_size += st.st_size
                     
-                    cache_time = datetime.fromisoformat(data['timestamp'])
-                    if datetime.now() - cache_time < self.cache_duration:
+                    if not self._is_expired(st.st_mtime, now):
                         valid_files += 1
                     else:
                         expired_files += 1
@@ -2,50 +2,112 @@
 # This module contains the DownloadManager and DownloadWorker for handling file downloads.
 
 import os
+import sys
+import atexit
 import logging
 import time
+import random
+from pathlib import Path
+from collections import defaultdict
 from urllib.parse import urlparse, unquote
 import requests
+from requests.adapters import HTTPAdapter
 from ftplib import FTP, error_perm
-from PyQt5.QtCore import QObject, QThread, pyqtSignal, QMutex, QWaitCondition, QMutexLocker
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, QMutex, QWaitCondition, QMutexLocker
 
 from .utils import SizeCalculator
+from ._json import loads, dumps
 
 logger = logging.getLogger(__name__)
 
-class DownloadWorker(QThread):
-    """A QThread that handles the download of a single file."""
-    progress = pyqtSignal(str, int, int)
+# Write buffer for downloaded files; large enough that most chunks don't hit write() individually
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+def _open_download_file(local_filename, append):
+    """Open a local file for streaming a download into, with a large write buffer."""
+    f = open(local_filename, 'ab' if append else 'wb', buffering=WRITE_BUFFER_SIZE)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return f
+
+class DownloadWorkerSignals(QObject):
+    """Signals for a DownloadWorker, which as a QRunnable cannot define its own."""
+    progress = pyqtSignal(str, int, int, int)  # worker_id, downloaded, total, bytes per second
     finished = pyqtSignal(str, int)
     error = pyqtSignal(str, str)
     status_changed = pyqtSignal(str, str)
 
-    def __init__(self, worker_id, url, rel_path, base_folder, config, total_size=0):
+class DownloadWorker(QRunnable):
+    """A QRunnable that handles the download of a single file on the download manager's thread pool."""
+
+    # Minimum seconds between progress signals while streaming a file
+    PROGRESS_INTERVAL = 0.1
+    # Weight of the newest sample in the smoothed transfer speed reported with progress
+    SPEED_SMOOTHING = 0.3
+    # Upper bound in seconds for the exponential retry backoff
+    MAX_RETRY_DELAY = 60
+
+    def __init__(self, worker_id, url, rel_path, base_folder, config, total_size=0, session=None):
         super().__init__()
+        # The manager holds the reference; don't let the pool delete the C++ object under it
+        self.setAutoDelete(False)
+        self.signals = DownloadWorkerSignals()
+        self.progress, self.finished = self.signals.progress, self.signals.finished
+        self.error, self.status_changed = self.signals.error, self.signals.status_changed
         self.worker_id, self.url, self.rel_path, self.base_folder, self.config, self.total_size = worker_id, url, rel_path, base_folder, config, total_size
+        # Shared requests.Session for connection reuse; plain requests if none is given
+        self.session = session or requests
         self.parsed_url = urlparse(self.url)
+        # Per-worker constants, resolved once instead of on every attempt/chunk
+        self._scheme = self.parsed_url.scheme.lower()
+        self._retry_attempts = int(config.get('retry_attempts', 3))
+        self._retry_delay = int(config.get('retry_delay', 5))
+        self._chunk_size = int(config.get('chunk_size', 262144))
+        self._timeout = config.get('request_timeout', 30)
+        self._max_speed = config.get('max_download_speed', 0)  # 0 = unlimited
         self._is_running, self._is_paused = True, False
         self.mutex, self.pause_cond = QMutex(), QWaitCondition()
         self.bytes_downloaded_this_session = 0
+        self._last_report_time, self._last_report_bytes, self._speed = 0.0, None, None
 
     def run(self):
         if not self._is_running: return
         self.status_changed.emit(self.worker_id, "Downloading")
-        for attempt in range(self.config.get('retry_attempts', 3)):
+        for attempt in range(self._retry_attempts):
             if not self._is_running: break
             try:
-                if self.parsed_url.scheme.lower() in ('http', 'https'): self._download_http()
-                elif self.parsed_url.scheme.lower() in ('ftp', ''): self._download_ftp()
+                if self._scheme in ('http', 'https'): self._download_http()
+                elif self._scheme in ('ftp', ''): self._download_ftp()
                 else: raise ValueError(f"Unsupported scheme: {self.parsed_url.scheme}")
                 break
             except Exception as e:
                 logger.error(f"Attempt {attempt + 1} failed for {self.url}: {e}")
-                if attempt + 1 >= self.config.get('retry_attempts', 3): self.error.emit(self.worker_id, str(e))
+                if attempt + 1 >= self._retry_attempts: self.error.emit(self.worker_id, str(e))
                 else:
                     self.status_changed.emit(self.worker_id, f"Retrying ({attempt+1})...")
-                    time.sleep(self.config.get('retry_delay', 5))
+                    # Exponential backoff with jitter, slept in short slices so a cancel is honoured promptly
+                    delay = min(self._retry_delay * (2 ** attempt) + random.uniform(0, 1), self.MAX_RETRY_DELAY)
+                    for _ in range(int(delay * 10)):
+                        if not self._is_running: return
+                        time.sleep(0.1)
         if self._is_running: self.finished.emit(self.worker_id, self.bytes_downloaded_this_session)
 
+    def _report_progress(self, downloaded_bytes, total_size, force=False):
+        """Emit progress at most every PROGRESS_INTERVAL, with the smoothed transfer speed."""
+        now = time.monotonic()
+        elapsed = now - self._last_report_time
+        if not force and elapsed < self.PROGRESS_INTERVAL:
+            return
+        # A forced report right after the last one is too short a window to measure speed over
+        if self._last_report_bytes is not None and elapsed >= self.PROGRESS_INTERVAL:
+            speed = (downloaded_bytes - self._last_report_bytes) / elapsed
+            self._speed = speed if self._speed is None else self._speed + self.SPEED_SMOOTHING * (speed - self._speed)
+        self._last_report_time, self._last_report_bytes = now, downloaded_bytes
+        self.progress.emit(self.worker_id, downloaded_bytes, total_size, int(self._speed or 0))
+
     def _download_http(self):
         # Decode percent-encoded rel_path for local file creation
         local_filename = os.path.join(self.base_folder, unquote(self.rel_path))
@@ -56,12 +118,11 @@ class DownloadWorker(QThread):
             resumed_bytes = os.path.getsize(local_filename)
             headers['Range'] = f'bytes={resumed_bytes}-'
         
-        # Get optimal chunk size based on config
-        chunk_size = self.config.get('chunk_size', 8192)
-        max_speed = self.config.get('max_download_speed', 0)  # 0 = unlimited
+        chunk_size, max_speed = self._chunk_size, self._max_speed
+        self._last_report_bytes = None  # Speed is measured from this attempt's first chunk
         
-        with requests.get(self.url, stream=True, headers=headers, 
-                         timeout=self.config.get('request_timeout', 30)) as r:
+        with self.session.get(self.url, stream=True, headers=headers, 
+                         timeout=self._timeout) as r:
             r.raise_for_status()
             
             # Calculate total size
@@ -78,7 +139,7 @@ class DownloadWorker(QThread):
             last_time = time.time()
             bytes_this_second = 0
             
-            with open(local_filename, 'ab' if resumed_bytes > 0 else 'wb') as f:
+            with _open_download_file(local_filename, resumed_bytes > 0) as f:
                 for chunk in r.iter_content(chunk_size=chunk_size):
                     with QMutexLocker(self.mutex):
                         if not self._is_running: 
@@ -108,18 +169,21 @@ class DownloadWorker(QThread):
                         chunk_len = len(chunk)
                         downloaded_bytes += chunk_len
                         self.bytes_downloaded_this_session += chunk_len
-                        self.progress.emit(self.worker_id, downloaded_bytes, total_size)
+                        self._report_progress(downloaded_bytes, total_size)
+            # Always report the final byte count
+            self._report_progress(downloaded_bytes, total_size, force=True)
 
     def _download_ftp(self):
         # Decode percent-encoded rel_path for local file creation
         local_filename = os.path.join(self.base_folder, unquote(self.rel_path))
         os.makedirs(os.path.dirname(local_filename), exist_ok=True)
-        with FTP(self.parsed_url.netloc, timeout=self.config.get('request_timeout')) as ftp:
+        with FTP(self.parsed_url.netloc, timeout=self._timeout) as ftp:
             ftp.login()
             total_size = self.total_size or ftp.size(self.parsed_url.path)
             downloaded_bytes = 0
             if os.path.exists(local_filename): downloaded_bytes = os.path.getsize(local_filename)
-            with open(local_filename, 'ab' if downloaded_bytes > 0 else 'wb') as f:
+            self._last_report_bytes = None
+            with _open_download_file(local_filename, downloaded_bytes > 0) as f:
                 def callback(chunk):
                     nonlocal downloaded_bytes
                     with QMutexLocker(self.mutex):
@@ -129,8 +193,9 @@ class DownloadWorker(QThread):
                     chunk_len = len(chunk)
                     downloaded_bytes += chunk_len
                     self.bytes_downloaded_this_session += chunk_len
-                    self.progress.emit(self.worker_id, downloaded_bytes, total_size)
-                ftp.retrbinary(f'RETR {self.parsed_url.path}', callback, blocksize=self.config.get('chunk_size'), rest=downloaded_bytes or None)
+                    self._report_progress(downloaded_bytes, total_size)
+                ftp.retrbinary(f'RETR {self.parsed_url.path}', callback, blocksize=self._chunk_size, rest=downloaded_bytes or None)
+                self._report_progress(downloaded_bytes, total_size, force=True)
 
     def stop(self):
         with QMutexLocker(self.mutex):
@@ -159,23 +224,118 @@ class DownloadManager(QObject):
     size_calc_finished = pyqtSignal()
     downloads_updated = pyqtSignal()
 
+    UPDATE_INTERVAL_MS = 100
+    # Below this much available memory only one download runs at a time
+    LOW_MEMORY_BYTES = 500 * 1024 * 1024
+    HEADROOM_CHECK_INTERVAL = 1.0
+
     def __init__(self, config):
         super().__init__()
         self.config = config
         self.download_queue, self.active_workers, self.file_sizes = [], {}, {}
         self.total_bytes_to_download, self.total_bytes_downloaded = 0, 0
         self.size_calculator = None
+        # Reused worker threads; check_queue keeps the pool size in step with the setting.
+        # Downloads get their own pool so long-running workers never starve work queued on Qt's global pool
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(config.get('max_concurrent_downloads', 4))
+        atexit.register(self._stop_workers)
+        # File sizes remembered across sessions so re-queued URLs skip the size probe
+        self._size_cache_file = os.path.join(config.get('cache_dir', 'cache'), 'sizes.json')
+        self._size_cache = self._load_size_cache()
+        self._size_cache_dirty = False
+        # One pooled HTTP session shared by all workers so connections are kept alive
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.http.mount('http://', adapter)
+        self.http.mount('https://', adapter)
         # Persistent download state
         self.downloads = []  # List of dicts: {url, rel_path, status, progress, size, file_path, ...}
+        # Indexes into self.downloads so per-event lookups don't scan the whole list
+        self._by_key = {}  # (url, rel_path) -> download dict
+        self._by_url = defaultdict(list)  # url -> [download dict, ...] in insertion order
+        # Per-chunk progress is coalesced and delivered at most every UPDATE_INTERVAL_MS
+        self._pending_update = False
+        self._pending_progress = {}  # worker_id -> (downloaded, total)
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(self.UPDATE_INTERVAL_MS)
+        self._update_timer.timeout.connect(self._flush_pending_updates)
+        self._low_memory, self._headroom_checked = False, float('-inf')
+
+    def _system_headroom(self, max_workers):
+        """Number of workers the system can take right now, re-read at most once a second."""
+        if not sys.platform.startswith('linux'):
+            return max_workers
+        now = time.monotonic()
+        if now - self._headroom_checked >= self.HEADROOM_CHECK_INTERVAL:
+            self._headroom_checked = now
+            self._low_memory = False
+            try:
+                with open('/proc/meminfo', 'rb') as f:
+                    for line in f:
+                        if line.startswith(b'MemAvailable:'):
+                            self._low_memory = int(line.split()[1]) * 1024 < self.LOW_MEMORY_BYTES
+                            break
+            except (OSError, ValueError, IndexError):
+                pass
+        return 1 if self._low_memory else max_workers
+
+    def _add_download(self, entry):
+        self.downloads.append(entry)
+        self._by_key[(entry['url'], entry['rel_path'])] = entry
+        self._by_url[entry['url']].append(entry)
+
+    def _load_size_cache(self):
+        try:
+            return loads(Path(self._size_cache_file).read_bytes())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Could not load size cache {self._size_cache_file}: {e}")
+            return {}
+
+    def _save_size_cache(self):
+        if not self._size_cache_dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._size_cache_file) or '.', exist_ok=True)
+            Path(self._size_cache_file).write_bytes(dumps(self._size_cache))
+            self._size_cache_dirty = False
+        except Exception as e:
+            logger.warning(f"Could not save size cache {self._size_cache_file}: {e}")
+
+    def _remember_size(self, url, size):
+        if size > 0 and self._size_cache.get(url) != size:
+            self._size_cache[url] = size
+            self._size_cache_dirty = True
 
-    def start_downloads(self, file_tuples, base_folder):
+    def start_downloads(self, file_tuples, base_folder, listed_sizes=None):
         # Remove storing base_folder as instance variable
-        new_urls = [url for url, _ in file_tuples if url not in [d['url'] for d in self.downloads if d['status'] in ('Queued','Downloading','Paused')] and url not in self.active_workers]
+        busy_urls = {d['url'] for d in self.downloads if d['status'] in ('Queued', 'Downloading', 'Paused')}
+        busy_urls.update(self.active_workers)
+        new_urls = [url for url, _ in file_tuples if url not in busy_urls]
         if not new_urls:
             return
-        self.size_calculator = SizeCalculator(new_urls, self.config)
+        # Known sizes come from the directory listing or the cache; HTTP sizes are learned
+        # from the GET's Content-Length, so only unknown FTP files still need probing up front
+        known_sizes, to_probe = {}, []
+        listed_sizes = listed_sizes or {}
+        for url in new_urls:
+            if url in listed_sizes:
+                known_sizes[url] = listed_sizes[url]
+            elif url in self._size_cache:
+                known_sizes[url] = self._size_cache[url]
+            elif urlparse(url).scheme.lower() in ('http', 'https'):
+                known_sizes[url] = 0
+            else:
+                to_probe.append(url)
+        if not to_probe:
+            self._on_size_calc_finished(sum(known_sizes.values()), known_sizes, file_tuples, base_folder)
+            return
+        self.size_calculator = SizeCalculator(to_probe, self.config)
         self.size_calculator.progress.connect(self.size_calc_progress)
-        self.size_calculator.finished.connect(lambda total_size, file_sizes_map: self._on_size_calc_finished(total_size, file_sizes_map, file_tuples, base_folder))
+        self.size_calculator.finished.connect(lambda total_size, file_sizes_map: self._on_size_calc_finished(total_size + sum(known_sizes.values()), {**known_sizes, **file_sizes_map}, file_tuples, base_folder))
         self.size_calculator.error.connect(lambda msg: self.error.emit("Size Calculation", msg))
         self.size_calculator.start()
 
@@ -185,14 +345,17 @@ class DownloadManager(QObject):
             if url not in self.file_sizes:
                 self.file_sizes[url] = size
                 self.total_bytes_to_download += size
+            self._remember_size(url, size)
+        self._save_size_cache()
         for url, rel_path in file_tuples:
-            if url in file_sizes_map and not any(d['url'] == url and d['rel_path'] == rel_path for d in self.downloads):
+            if url in file_sizes_map and (url, rel_path) not in self._by_key:
                 # Store base_folder with each download item
                 full_path = os.path.join(base_folder, rel_path)
                 logger.info(f"Adding download: {os.path.basename(rel_path)} to folder: {base_folder}")
-                self.downloads.append({
+                self._add_download({
                     'url': url,
                     'rel_path': rel_path,
+                    'name': os.path.basename(url),
                     'status': 'Queued',
                     'progress': 0,
                     'size': self.file_sizes[url],
@@ -209,67 +372,100 @@ class DownloadManager(QObject):
 
     def check_queue(self):
         if not self.download_queue and not self.active_workers:
+            self._save_size_cache()
             if self.total_bytes_downloaded >= self.total_bytes_to_download - 1:
                 self.all_finished.emit()
             return
         max_workers = self.config.get('max_concurrent_downloads', 4)
-        while self.download_queue and len(self.active_workers) < max_workers:
+        if self.pool.maxThreadCount() != max_workers:
+            self.pool.setMaxThreadCount(max_workers)
+        effective_max = self._system_headroom(max_workers)
+        while self.download_queue and len(self.active_workers) < effective_max:
 
             # Use base_folder from the queue entry
             url, rel_path, base_folder = self.download_queue.pop(0)
             logger.info(f"Starting download: {os.path.basename(rel_path)} to folder: {base_folder}")
-            worker = DownloadWorker(url, url, rel_path, base_folder, self.config, self.file_sizes.get(url, 0))
+            worker = DownloadWorker(url, url, rel_path, base_folder, self.config, self.file_sizes.get(url, 0), session=self.http)
             worker.finished.connect(self._on_worker_finished)
             worker.error.connect(self._on_worker_error)
-            worker.progress.connect(self.file_progress)
             worker.progress.connect(self._on_file_progress_update)
             worker.status_changed.connect(self.file_status_changed)
             self.active_workers[url] = worker
             self._update_download_status(url, 'Downloading')
-            self.file_started.emit(url, os.path.basename(url))
-            worker.start()
+            self.file_started.emit(url, self._file_name(url))
+            self.pool.start(worker)
             self.downloads_updated.emit()
 
     def _on_worker_finished(self, worker_id, bytes_downloaded):
-        # Use a mutex if updating shared overall progress is still needed
-        # with QMutexLocker(self.progress_mutex):
+        # Worker signals are queued onto this thread, so no lock is needed here
         self.total_bytes_downloaded += bytes_downloaded
-
         self.overall_progress.emit(self.total_bytes_downloaded, self.total_bytes_to_download)
-        if worker_id in self.active_workers:
-            self.file_finished.emit(worker_id, os.path.basename(self.active_workers[worker_id].url))
+        worker = self.active_workers.pop(worker_id, None)
+        if worker is not None:
+            self.file_finished.emit(worker_id, self._file_name(worker.url))
             self._update_download_status(worker_id, 'Completed')
-            del self.active_workers[worker_id]
             self.downloads_updated.emit()
             self.check_queue()
 
     def _on_worker_error(self, worker_id, message):
-        if worker_id in self.active_workers:
-            self.error.emit(os.path.basename(self.active_workers[worker_id].url), message)
+        worker = self.active_workers.pop(worker_id, None)
+        if worker is not None:
+            self.error.emit(self._file_name(worker.url), message)
             self.file_status_changed.emit(worker_id, "Error")
             self._update_download_status(worker_id, 'Failed')
-            del self.active_workers[worker_id]
             self.downloads_updated.emit()
             self.check_queue()
 
+    def _file_name(self, url):
+        entries = self._by_url.get(url)
+        return entries[0]['name'] if entries else os.path.basename(url)
+
     def _update_download_status(self, url, status):
-        for d in self.downloads:
-            if d['url'] == url:
-                d['status'] = status
-                if status == 'Completed':
-                    d['progress'] = 100
-                break
+        entries = self._by_url.get(url)
+        if entries:
+            d = entries[0]
+            d['status'] = status
+            if status == 'Completed':
+                d['progress'] = 100
 
-    def update_progress(self, url, downloaded, total):
-        for d in self.downloads:
-            if d['url'] == url:
-                d['progress'] = int((downloaded / total) * 100) if total else 0
-                break
-        self.downloads_updated.emit()
+    def update_progress(self, url, downloaded, total, speed=0):
+        entries = self._by_url.get(url)
+        if entries:
+            d = entries[0]
+            d['progress'] = int((downloaded / total) * 100) if total else 0
+            # Speed comes from the worker's own byte counts; the UI only formats the ETA
+            d['speed_bps'] = speed
+            d['eta_seconds'] = (total - downloaded) // speed if speed > 0 and total > downloaded else None
+        self._schedule_update()
 
-    def _on_file_progress_update(self, worker_id, downloaded, total):
-        self.update_progress(worker_id, downloaded, total)
-        # self.downloads_updated.emit()  # Removed to prevent UI freeze
+    def _update_file_size(self, url, size):
+        # The worker reported the real size (e.g. Content-Length); fix up totals
+        self.total_bytes_to_download += size - self.file_sizes.get(url, 0)
+        self.file_sizes[url] = size
+        entries = self._by_url.get(url)
+        if entries:
+            entries[0]['size'] = size
+        self._remember_size(url, size)
+
+    def _schedule_update(self):
+        self._pending_update = True
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def _flush_pending_updates(self):
+        pending, self._pending_progress = self._pending_progress, {}
+        for worker_id, (downloaded, total) in pending.items():
+            self.file_progress.emit(worker_id, downloaded, total)
+        if self._pending_update:
+            self._pending_update = False
+            self.downloads_updated.emit()
+
+    def _on_file_progress_update(self, worker_id, downloaded, total, speed):
+        if total and total != self.file_sizes.get(worker_id):
+            self._update_file_size(worker_id, total)
+        # Only the latest progress per file is forwarded on the next flush
+        self._pending_progress[worker_id] = (downloaded, total)
+        self.update_progress(worker_id, downloaded, total, speed)
 
     def pause_file(self, worker_id):
         if worker_id in self.active_workers: self.active_workers[worker_id].pause(); self._update_download_status(worker_id, 'Paused'); self.downloads_updated.emit()
@@ -283,6 +479,11 @@ class DownloadManager(QObject):
     def resume_all(self):
         for worker in self.active_workers.values(): worker.resume(); self._update_download_status(worker.worker_id, 'Downloading')
         self.downloads_updated.emit()
+    def _stop_workers(self):
+        """Stop running workers and give them a moment to leave the pool before exit."""
+        for worker in list(self.active_workers.values()):
+            worker.stop()
+        self.pool.waitForDone(2000)
     def cancel_all(self):
         # Cancel all active workers
         for worker in self.active_workers.values():
@@ -290,19 +491,19 @@ class DownloadManager(QObject):
             self._update_download_status(worker.worker_id, 'Canceled')
         # Mark all queued downloads as canceled
         for url, rel_path, base_folder in self.download_queue:
-            for d in self.downloads:
-                if d['url'] == url and d['rel_path'] == rel_path and d['status'] == 'Queued':
-                    d['status'] = 'Canceled'
-                    d['progress'] = 0
+            d = self._by_key.get((url, rel_path))
+            if d is not None and d['status'] == 'Queued':
+                d['status'] = 'Canceled'
+                d['progress'] = 0
         self.download_queue.clear()
         self.downloads_updated.emit()
 
     def retry_download(self, url):
         # Find the download and re-queue it
-        for d in self.downloads:
-            if d['url'] == url and d['status'] in ('Failed', 'Canceled'):
+        for d in self._by_url.get(url, ()):
+            if d['status'] in ('Failed', 'Canceled'):
                 d['status'] = 'Queued'
-                d['progress'] = 0
+                d['progress'], d['eta_seconds'] = 0, None
                 # Use the stored base_folder for this download
                 self.download_queue.append((d['url'], d['rel_path'], d['base_folder']))
                 self.downloads_updated.emit()
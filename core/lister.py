@@ -1,48 +1,244 @@
 # core/lister.py
-# This module contains the DirectoryLister thread for fetching file lists from servers.
+# This module contains the DirectoryLister task for fetching file lists from servers.
 
+import os
+import re
+import queue
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, urljoin
 from ftplib import FTP, error_perm
 import requests
 from bs4 import BeautifulSoup
-from PyQt5.QtCore import QThread, pyqtSignal
-from .cache_manager import DirectoryCache
+from datetime import timedelta
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from .cache_manager import DirectoryCache, MemoryCache
+from .utils import http_session
 
 logger = logging.getLogger(__name__)
 
-class DirectoryLister(QThread):
-    """A QThread that lists files and directories from an FTP or HTTP URL."""
-    item_found = pyqtSignal(dict)
+# Size column of Apache/nginx autoindex pages: "12345", "1.5K", "345M", "2.1G"
+_SIZE_RE = re.compile(r'^(\d+(?:\.\d+)?)([KMGTP]?)(?:i?B)?$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4, 'P': 1024 ** 5}
+
+# One Unix-style LIST line: permissions, links, owner, group, size, date (3 fields), name
+_LIST_RE = re.compile(r'^(?P<perm>[\-dl][\-rwxsStT]{9})[+@.]?\s+\d+\s+\S+\s+\S+\s+(?P<size>\d+)\s+(?P<month>\S+)\s+(?P<day>\S+)\s+(?P<time>\S+)\s+(?P<name>.+)$')
+
+def parse_listing_size(text):
+    """Convert an autoindex size such as '1.5M' or '12345' to bytes, or None if it isn't a size."""
+    match = _SIZE_RE.match(text)
+    if not match:
+        return None
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+def _listing_size(link):
+    """Find the size shown next to a link on an autoindex page."""
+    sibling = link.next_sibling
+    if isinstance(sibling, str):
+        # <pre> listings: the text after the link ends with the size, e.g. "  01-Jan-2024 12:00  1.5M"
+        tokens = sibling.split()
+        return parse_listing_size(tokens[-1]) if tokens else None
+    cell = link.find_parent('td')
+    if cell is not None:
+        # Table listings: the size sits in a later cell of the same row
+        for td in cell.find_next_siblings('td'):
+            size = parse_listing_size(td.get_text(strip=True))
+            if size is not None:
+                return size
+    return None
+
+# lxml parses large autoindex pages incrementally as they download; without it the page is
+# buffered and parsed with the stdlib parser
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Charset from a Content-Type header or a <meta> tag near the top of the page
+_CHARSET_RE = re.compile(rb'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Links that are sort controls, anchors or the way back up rather than listing entries
+_SKIP_PREFIXES = frozenset({'', '?', '#'})
+_PARENT_TEXTS = frozenset({'parent directory', '..', '../'})
+
+def _soup_links(content):
+    """Return (href, text, size) for each link on a buffered autoindex page."""
+    soup = BeautifulSoup(content, 'html.parser')
+    return [(link['href'], link.get_text(strip=True), _listing_size(link))
+            for link in soup.find_all('a', href=True)]
+
+def _page_encoding(response, head):
+    """Pick the page encoding from the response header or the first chunk, defaulting to UTF-8."""
+    match = (_CHARSET_RE.search(response.headers.get('Content-Type', '').encode('latin-1'))
+             or _CHARSET_RE.search(head[:4096]))
+    return match.group(1).decode('ascii') if match else 'utf-8'
+
+def _cell_text(elem):
+    return ''.join(elem.itertext()).strip()
+
+def _stream_links(response):
+    """Parse an autoindex page as it downloads and return (href, text, size) for each link.
+    
+    Elements are discarded once their link has been read, so memory is bounded by the
+    link records rather than by the size of the page.
+    """
+    chunks = response.iter_content(STREAM_CHUNK_SIZE)
+    head = next(chunks, b'')
+    try:
+        parser = etree.HTMLPullParser(events=('end',), encoding=_page_encoding(response, head))
+    except LookupError:
+        parser = etree.HTMLPullParser(events=('end',), encoding='utf-8')
+    links = []
+    pending = None  # <pre> link whose trailing text (holding the size) may still be arriving
+    row = []        # links in the table row currently being parsed
+
+    def finish_pending():
+        record, elem = pending
+        tokens = (elem.tail or '').split()
+        record[2] = parse_listing_size(tokens[-1]) if tokens else None
+        elem.getparent().remove(elem)
+
+    def finish_row():
+        for record, elem in row:
+            # Table listings: the size sits in a later cell of the same row
+            for td in elem.getparent().itersiblings('td'):
+                size = parse_listing_size(_cell_text(td))
+                if size is not None:
+                    record[2] = size
+                    break
+        row.clear()
+
+    def drain():
+        nonlocal pending
+        for _, elem in parser.read_events():
+            tag = elem.tag
+            if tag == 'a':
+                href = elem.get('href')
+                if not href:
+                    continue
+                record = [href, _cell_text(elem), None]
+                links.append(record)
+                parent = elem.getparent()
+                if parent is not None and parent.tag == 'td':
+                    row.append((record, elem))
+                else:
+                    # The previous link's tail is complete once a later link has closed
+                    if pending is not None:
+                        finish_pending()
+                    pending = (record, elem)
+            elif tag == 'tr':
+                finish_row()
+                parent = elem.getparent()
+                if parent is not None:
+                    parent.remove(elem)
+
+    if head:
+        parser.feed(head)
+        drain()
+    for chunk in chunks:
+        parser.feed(chunk)
+        drain()
+    parser.close()
+    drain()
+    finish_row()
+    if pending is not None:
+        finish_pending()
+    return [tuple(record) for record in links]
+
+def _read_links(response):
+    """Return (href, text, size) for each link on a directory page response."""
+    if etree is not None:
+        return _stream_links(response)
+    return _soup_links(response.content)
+
+class DirectoryListerSignals(QObject):
+    """Signals for a DirectoryLister, which as a QRunnable cannot define its own."""
+    item_found_batch = pyqtSignal(list)  # Lists of item dicts; BATCH_SIZE at a time while listing
     error = pyqtSignal(str)
     finished = pyqtSignal()
     cache_status = pyqtSignal(str)  # New signal for cache status
 
+class DirectoryLister(QRunnable):
+    """A QRunnable that lists files and directories from an FTP or HTTP URL on the listing pool."""
+
+    # Listings get their own threads so a fetch never queues behind other pooled work.
+    # Two threads let a new fetch start while a cancelled one winds down.
+    _pool = None
+    POOL_SIZE = 2
+
+    # Items go to the UI in chunks so a large directory costs a few queued signals, not one per entry
+    BATCH_SIZE = 128
+    
+    # Listings from this session, shared by every lister so repeat browses skip the disk cache
+    _shared_cache = MemoryCache(maxsize=256, ttl=24 * 3600)
+    
+    # Page entries not revalidated for this long are pruned, once per session, by the first HTTP listing
+    PAGE_CACHE_MAX_AGE = timedelta(days=30)
+    _pages_pruned = False
+
     def __init__(self, url, config):
         super().__init__()
+        # The main window holds the reference; don't let the pool delete the C++ object under it
+        self.setAutoDelete(False)
+        self.signals = DirectoryListerSignals()
+        self.item_found_batch, self.error = self.signals.item_found_batch, self.signals.error
+        self.finished, self.cache_status = self.signals.finished, self.signals.cache_status
         self.url = url
         self.config = config
         self.parsed_url = urlparse(self.url)
         self.base_url = url if url.endswith('/') else url + '/'
         self._cancelled = False
         self.cache = DirectoryCache()  # Initialize cache
+        # Per-page links with their ETag/Last-Modified, revalidated with conditional GETs
+        self.page_cache = DirectoryCache(os.path.join(self.cache.cache_dir, 'pages'),
+                                         cache_duration=self.PAGE_CACHE_MAX_AGE)
+        # Settings are read once per listing rather than on every directory
+        self._listing_depth = config.get('listing_depth', 3)
+        self._timeout = config.get('request_timeout', 30)
+        # Results depend on how deep the walk goes, so the depth is part of the in-memory and disk keys
+        self._memory_key = (url, self._listing_depth)
+        self._disk_key = f"{url}#depth={self._listing_depth}"
+
+    @classmethod
+    def pool(cls):
+        """The thread pool listings run on; its threads are kept and reused between fetches."""
+        if cls._pool is None:
+            cls._pool = QThreadPool()
+            cls._pool.setMaxThreadCount(cls.POOL_SIZE)
+        return cls._pool
+
+    def start(self):
+        """Queue the listing on the listing pool."""
+        self.pool().start(self)
 
     def cancel(self):
         self._cancelled = True
 
+    def _emit_batches(self, items, start=0):
+        """Send items[start:] to the UI in chunks of BATCH_SIZE."""
+        for i in range(start, len(items), self.BATCH_SIZE):
+            if self._cancelled: break
+            self.item_found_batch.emit(items[i:i + self.BATCH_SIZE])
+
     def run(self):
         try:
-            # First try to get from cache
-            cached_items = self.cache.get(self.url)
+            # First try the in-process cache, then the disk cache
+            cached_items = self._shared_cache.get(self._memory_key)
+            if cached_items is None:
+                cached_items = self.cache.get(self._disk_key)
+                if cached_items is not None:
+                    self._shared_cache.set(self._memory_key, cached_items)
             if cached_items is not None:
                 self.cache_status.emit("Loading from cache...")
                 logger.info(f"Using cached directory listing for {self.url}")
                 
-                # Emit cached items
-                for item in cached_items:
-                    if self._cancelled:
-                        return
-                    self.item_found.emit(item)
+                # Nothing is arriving from the network, so hand the whole listing over in one signal
+                self.item_found_batch.emit(cached_items)
+                if self._cancelled:
+                    return
                 
                 self.cache_status.emit("Loaded from cache")
                 self.finished.emit()
@@ -60,8 +256,9 @@ class DirectoryLister(QThread):
                 raise ValueError(f"Unsupported URL scheme: {self.parsed_url.scheme}")
             
             # Cache the items for future use
-            if items:
-                self.cache.set(self.url, items)
+            if items and not self._cancelled:
+                self._shared_cache.set(self._memory_key, items)
+                self.cache.set(self._disk_key, items)
                 self.cache_status.emit("Cached for future use")
             
         except Exception as e:
@@ -70,107 +267,269 @@ class DirectoryLister(QThread):
         finally:
             self.finished.emit()
 
-    def _list_ftp(self, path, current_depth=0):
-        """List FTP directory and return items."""
-        items = []
-        if self._cancelled: return items
-        if current_depth >= self.config.get('listing_depth', 3): return items
+    def _list_ftp(self, path):
+        """List an FTP directory tree over a small pool of logged-in connections."""
+        # Idle connections are handed between listing threads; each thread holds at most one
+        idle, opened = queue.Queue(), []
+        # Prefer machine-readable MLSD; drop to LIST for the rest of the walk if the server lacks it
+        server = {'mlsd': True}
         
-        try:
-            with FTP(self.parsed_url.netloc, timeout=self.config.get('request_timeout', 30)) as ftp:
-                ftp.login() # Anonymous login
-                ftp.cwd(path)
+        def fetch(dir_path):
+            # Directories still queued on the pool when the listing is cancelled are skipped
+            if self._cancelled:
+                return None
+            try:
+                ftp = idle.get_nowait()
+            except queue.Empty:
+                try:
+                    ftp = FTP(self.parsed_url.netloc, timeout=self._timeout)
+                    ftp.login() # Anonymous login
+                except Exception as e:
+                    logger.error(f"FTP error at {dir_path}: {e}")
+                    self.error.emit(f"FTP error: {e}")
+                    return None
+                opened.append(ftp)
+            try:
+                if server['mlsd']:
+                    try:
+                        entries = list(ftp.mlsd(dir_path))
+                        idle.put(ftp)
+                        return True, entries
+                    except error_perm as e:
+                        # 500/502 etc. mean the command is unknown; 550 is a problem with this directory
+                        if not str(e).startswith(('500', '501', '502', '504')): raise
+                        server['mlsd'] = False
+                # Absolute paths, so no need to restore the working directory between uses
+                ftp.cwd(dir_path)
                 lines = []
                 ftp.dir(lines.append)
-                
-                for line in lines:
-                    if self._cancelled: return items
-                    parts = line.split()
-                    if len(parts) < 9 or parts[8] in ('.', '..'): continue
-                    
-                    name = " ".join(parts[8:])
-                    is_dir = parts[0].startswith('d')
-                    full_path = f"{path.rstrip('/')}/{name}"
-                    
-                    item = {
-                        'name': name, 
-                        'size': parts[4], 
-                        'type': "Directory" if is_dir else "File",
-                        'modified': ' '.join(parts[5:8]), 
-                        'path': full_path
-                    }
-                    
-                    items.append(item)
-                    # Emit item immediately for UI responsiveness
-                    self.item_found.emit(item)
-                    
-                    # Recursively list subdirectories
-                    if is_dir: 
-                        sub_items = self._list_ftp(full_path, current_depth + 1)
-                        items.extend(sub_items)
-                        
-        except Exception as e:
-            logger.error(f"FTP error at {path}: {e}")
-            self.error.emit(f"FTP error: {e}")
+                idle.put(ftp)
+                return False, lines
+            except error_perm as e:
+                # The connection is still usable, only this directory failed
+                idle.put(ftp)
+                logger.error(f"FTP error at {dir_path}: {e}")
+                self.error.emit(f"FTP error: {e}")
+            except Exception as e:
+                logger.error(f"FTP error at {dir_path}: {e}")
+                self.error.emit(f"FTP error: {e}")
+            return None
         
-        return items
+        try:
+            with ThreadPoolExecutor(max_workers=self.config.get('ftp_pool_size', 4)) as pool:
+                return self._walk(path, pool, fetch, self._list_ftp_dir)
+        finally:
+            for ftp in opened:
+                try:
+                    ftp.quit()
+                except Exception:
+                    ftp.close()
 
-    def _list_http(self, url, current_depth=0):
-        """List HTTP directory and return items."""
+    def _list_ftp_dir(self, path, result, items):
+        """Collect one fetched directory's items, from MLSD or LIST output, and return its subdirectories."""
+        is_mlsd, data = result
+        if is_mlsd:
+            return self._parse_mlsd_listing(path, data, items)
+        return self._parse_ftp_listing(path, data, items)
+
+    def _parse_mlsd_listing(self, path, entries, items):
+        """Collect the items in one MLSD response and return the subdirectory paths to descend into."""
+        subdirs = []
+        prefix = path.rstrip('/')
+        parent = prefix or '/'  # Directory holding every entry; the tree model files items under it
+        append = items.append
+        for name, facts in entries:
+            if self._cancelled: break
+            kind = facts.get('type', 'file').lower()
+            if kind in ('cdir', 'pdir') or name in ('.', '..'): continue
+            
+            is_dir = kind == 'dir'
+            full_path = f"{prefix}/{name}"
+            size = facts.get('size', '')
+            modify = facts.get('modify', '')
+            
+            item = {
+                'name': name, 
+                'size': int(size) if size.isdigit() else '-', 
+                'type': "Directory" if is_dir else "File",
+                # modify is YYYYMMDDHHMMSS[.sss] in UTC
+                'modified': f"{modify[:4]}-{modify[4:6]}-{modify[6:8]} {modify[8:10]}:{modify[10:12]}" if len(modify) >= 12 else '-', 
+                'path': full_path,
+                'parent': parent
+            }
+            
+            append(item)
+            
+            # Subdirectories are queued for the next level
+            if is_dir:
+                subdirs.append(full_path)
+        
+        return subdirs
+
+    def _parse_ftp_listing(self, path, lines, items):
+        """Collect the items in one LIST response and return the subdirectory paths to descend into."""
+        subdirs = []
+        # Bind loop invariants to locals so the per-line work stays cheap
+        prefix = path.rstrip('/')
+        parent = prefix or '/'  # Directory holding every entry; the tree model files items under it
+        append = items.append
+        match = _LIST_RE.match
+        for line in lines:
+            if self._cancelled: break
+            m = match(line)
+            if not m: continue
+            name = m['name']
+            if name in ('.', '..'): continue
+            
+            is_dir = m['perm'][0] == 'd'
+            full_path = f"{prefix}/{name}"
+            
+            item = {
+                'name': name, 
+                'size': int(m['size']), 
+                'type': "Directory" if is_dir else "File",
+                'modified': f"{m['month']} {m['day']} {m['time']}", 
+                'path': full_path,
+                'parent': parent
+            }
+            
+            append(item)
+            
+            # Subdirectories are queued for the next level
+            if is_dir:
+                subdirs.append(full_path)
+        
+        return subdirs
+
+    def _walk(self, root, pool, fetch, list_dir):
+        """Breadth-first walk of the directory tree under root.
+        
+        Directories wait in a queue as (path, depth). Each depth is fetched together on
+        the pool with fetch(path), then list_dir(path, result, items) appends that
+        directory's items, which are emitted in batches, and returns the subdirectories to queue.
+        """
         items = []
-        if self._cancelled: return items
-        if current_depth >= self.config.get('listing_depth', 3): return items
+        pending = deque([(root, 0)])
+        while pending and not self._cancelled:
+            # Everything queued shares one depth, since a level is drained before the next is queued
+            depth = pending[0][1]
+            batch = [path for path, _ in pending]
+            pending.clear()
+            logger.info(f"Listing {len(batch)} directories at depth {depth}")
+            futures = [pool.submit(fetch, path) for path in batch]
+            # Results are taken in submission order, so items still arrive grouped per directory
+            for path, future in zip(batch, futures):
+                result = future.result()
+                if self._cancelled:
+                    # Drop the fetches that haven't started; only those in flight are waited for
+                    for pending_fetch in futures:
+                        pending_fetch.cancel()
+                    break
+                if result is None: continue
+                start = len(items)
+                subdirs = list_dir(path, result, items)
+                # Each directory is flushed as soon as it's parsed, including a partial one on cancel
+                self._emit_batches(items, start)
+                if depth + 1 < self._listing_depth:
+                    pending.extend((subdir, depth + 1) for subdir in subdirs)
+        return items
+
+    def _list_http(self, url):
+        """List an HTTP directory tree, fetching each level's pages concurrently."""
+        if not DirectoryLister._pages_pruned:
+            DirectoryLister._pages_pruned = True
+            self.page_cache.clear_expired()
+        with ThreadPoolExecutor(max_workers=self.config.get('http_concurrency', 8)) as pool:
+            return self._walk(url, pool, self._fetch_http, self._list_http_page)
+
+    def _list_http_page(self, page_url, result, items):
+        """Collect one fetched page's items and return its subdirectories.
         
-        logger.info(f"Listing HTTP directory at depth {current_depth}: {url}")
+        The page cache holds the page's raw links rather than items, since item paths depend on
+        the root being listed; links replayed after a 304 are parsed against this lister's root.
+        """
+        links, headers = result
+        start = len(items)
+        subdirs = self._parse_http_listing(page_url, links, items)
+        logger.info(f"Listed {len(items) - start} items at {page_url}")
+        if headers is not None and not self._cancelled:
+            etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+            if etag or last_modified:
+                self.page_cache.set(page_url, links, etag, last_modified)
+        return subdirs
+
+    def _fetch_http(self, url):
+        """Fetch and parse one directory page; runs on the listing pool.
         
+        Returns (links, headers), or None on error. When the server confirms the cached page
+        is unchanged, the cached links are returned with headers None and nothing is downloaded.
+        """
+        # Pages still queued on the pool when the listing is cancelled are skipped
+        if self._cancelled:
+            return None
+        entry = self.page_cache.get_entry(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'): headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'): headers['If-Modified-Since'] = entry['last_modified']
         try:
-            response = requests.get(url, timeout=self.config.get('request_timeout', 30))
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            for link in soup.find_all('a'):
-                if self._cancelled: return items
-                href = link.get('href')
-                if not href or href.startswith('?') or href.startswith('#') or link.get_text(strip=True).lower() == 'parent directory': 
-                    continue
-                    
-                full_url = urljoin(url, href)
-                is_dir = href.endswith('/')
-                link_text = link.get_text(strip=True)
-                
-                # Extract the relative path from the base URL for proper tree building
-                if full_url.startswith(self.base_url):
-                    relative_path = full_url[len(self.base_url):].rstrip('/')
-                    if not relative_path:  # Root directory
-                        relative_path = '/'
-                else:
-                    relative_path = href.rstrip('/')
-                    if not relative_path:
-                        relative_path = '/'
-                
-                logger.info(f"Found item: {link_text} ({'Directory' if is_dir else 'File'}) at path: {relative_path}")
-                
-                item = {
-                    'name': link_text, 
-                    'size': '-', 
-                    'type': "Directory" if is_dir else "File",
-                    'modified': '-', 
-                    'path': relative_path, 
-                    'full_url': full_url
-                }
-                
-                items.append(item)
-                # Emit item immediately for UI responsiveness
-                self.item_found.emit(item)
-                
-                # Recursively list subdirectories
-                if is_dir and full_url.startswith(self.base_url):
-                    logger.info(f"Recursively listing subdirectory: {full_url}")
-                    sub_items = self._list_http(full_url, current_depth + 1)
-                    items.extend(sub_items)
-                    
+            with http_session().get(url, timeout=self._timeout, headers=headers, stream=True) as response:
+                if response.status_code == 304 and entry:
+                    self.page_cache.touch(url)
+                    return entry['content'], None
+                response.raise_for_status()
+                return _read_links(response), response.headers
         except requests.RequestException as e:
             logger.error(f"HTTP error for {url}: {e}")
             self.error.emit(f"HTTP error: {e}")
+            return None
+
+    def _parse_http_listing(self, url, links, items):
+        """Collect the items on one directory page and return the subdirectory URLs to descend into."""
+        subdirs = []
+        # Bind loop invariants to locals so the per-link work stays cheap
+        base_url = self.base_url
+        base_len = len(base_url)
+        append = items.append
+        skip_prefixes, parent_texts = _SKIP_PREFIXES, _PARENT_TEXTS
         
-        return items
+        for href, link_text, size in links:
+            if self._cancelled: break
+            if href[:1] in skip_prefixes or link_text.lower() in parent_texts:
+                continue
+                
+            full_url = urljoin(url, href)
+            is_dir = href.endswith('/')
+            
+            # Extract the relative path from the base URL for proper tree building
+            in_base = full_url.startswith(base_url)
+            if in_base:
+                relative_path = full_url[base_len:].rstrip('/')
+                if not relative_path:  # Root directory
+                    relative_path = '/'
+            else:
+                relative_path = href.rstrip('/')
+                if not relative_path:
+                    relative_path = '/'
+            
+            # Sizes shown on the page let downloads skip a separate size probe
+            if is_dir:
+                size = None
+            
+            item = {
+                'name': link_text, 
+                'size': '-' if size is None else size, 
+                'type': "Directory" if is_dir else "File",
+                'modified': '-', 
+                'path': relative_path, 
+                'parent': os.path.dirname(relative_path),
+                'full_url': full_url
+            }
+            
+            append(item)
+            
+            # Subdirectories are queued for the next level
+            if is_dir and in_base:
+                subdirs.append(full_url)
+        
+        return subdirs
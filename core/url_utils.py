@@ -1,40 +1,113 @@
 # core/url_utils.py
 # URL utility functions for proper encoding and validation
 
+import re
 import logging
-from urllib.parse import quote, unquote
-from PyQt5.QtCore import QUrl
+from functools import lru_cache
+from urllib.parse import quote, unquote, urlsplit, urlunsplit
 
 logger = logging.getLogger(__name__)
 
+# These helpers are pure functions of the URL string and the same URLs pass through them
+# many times per session, so results are memoized.
+URL_CACHE_SIZE = 4096
+
+SUPPORTED_SCHEMES = ('http', 'https', 'ftp')
+
+# Characters left as-is when encoding, matching what QUrl leaves unencoded
+_PATH_SAFE = "/:@!$&'()*+,;=[]%"
+_QUERY_SAFE = _PATH_SAFE + "?"
+# A '%' that doesn't start an escape sequence is a literal percent sign
+_STRAY_PERCENT = re.compile(r'%(?![0-9A-Fa-f]{2})')
+# Plain scheme://host[:port] prefix; such URLs are valid without a full parse
+_SIMPLE_URL = re.compile(r'(?:https?|ftp)://[A-Za-z0-9.-]+(?::\d*)?(?:[/?#]|$)')
+# A URL that is already fully encoded: lowercase scheme, ASCII host, and a path and query made only
+# of characters the encoder keeps ('&' only in the query) plus valid escapes
+_ENCODED_URL = re.compile(
+    r"[a-z]+://[A-Za-z0-9.\-:@\[\]]+"
+    r"(?:/(?:[A-Za-z0-9\-._~/:@!$'()*+,;=]|%[0-9A-Fa-f]{2})*)?"
+    r"(?:\?(?:[A-Za-z0-9\-._~/:@!$&'()*+,;=?]|%[0-9A-Fa-f]{2})+)?"
+)
+# Escapes kept in display URLs since decoding them would change the URL's structure
+_STRUCTURAL_ESCAPES = re.compile(r'(%(?:2[5Ff3]|3[Ff]))')
+
+# Same characters as str.isspace(), matched in one C-level scan
+_WHITESPACE = re.compile(r'\s')
+
+def _has_space(text):
+    return _WHITESPACE.search(text) is not None
+
+def _raw_path(url):
+    """Return the decoded path of a URL by slicing the string, without a full parse."""
+    end = len(url)
+    for sep in ('?', '#'):
+        i = url.find(sep)
+        if 0 <= i < end:
+            end = i
+    scheme_end = url.find('://', 0, end)
+    if scheme_end >= 0:
+        start = url.find('/', scheme_end + 3, end)
+        if start < 0:
+            return ''
+    else:
+        start = 0
+    path = url[start:end]
+    return unquote(path) if '%' in path else path
+
+def _encode_component(text, safe):
+    """Percent-encode a URL component, leaving existing escapes intact."""
+    if '%' in text:
+        text = _STRAY_PERCENT.sub('%25', text)
+    return quote(text, safe=safe)
+
+def _encode_netloc(parts):
+    """Encode the host with IDNA when it isn't plain ASCII."""
+    netloc = parts.netloc
+    if netloc.isascii():
+        return netloc
+    host = parts.hostname or ''
+    return netloc.replace(host, host.encode('idna').decode('ascii'))
+
+def _encode(parts, path_safe=_PATH_SAFE):
+    return urlunsplit((
+        parts.scheme,
+        _encode_netloc(parts),
+        _encode_component(parts.path, path_safe),
+        _encode_component(parts.query, _QUERY_SAFE),
+        _encode_component(parts.fragment, _QUERY_SAFE),
+    ))
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def ensure_url_encoded(url):
     """Ensure URL is properly percent-encoded for FTP/HTTP operations."""
     if not url:
         return None
     
     try:
-        qurl = QUrl(url)
-        if not qurl.isValid():
+        url = url.strip()
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        
+        if _has_space(parts.netloc):
             logger.warning(f"Invalid URL: {url}")
             return None
         
         # Check if URL has a valid scheme and host
-        if not qurl.scheme() or (qurl.scheme().lower() != 'http' and qurl.scheme().lower() != 'https' and qurl.scheme().lower() != 'ftp'):
+        if scheme not in SUPPORTED_SCHEMES:
             logger.warning(f"Unsupported scheme in URL: {url}")
             return None
         
-        if not qurl.host() and qurl.scheme().lower() == 'ftp':
+        if not parts.hostname and scheme == 'ftp':
             logger.warning(f"FTP URL missing host: {url}")
             return None
         
-        # Handle special characters that QUrl doesn't encode properly
-        # QUrl tends to leave some characters unencoded that should be encoded for FTP
-        encoded_bytes = qurl.toEncoded()
-        encoded_url = encoded_bytes.data().decode('utf-8')
+        # Already-encoded URLs come back unchanged, so skip re-quoting each component.
+        # isascii() reads a flag on the string, so non-ASCII URLs skip the scan entirely.
+        if url.isascii() and _ENCODED_URL.fullmatch(url):
+            return url
         
-        # Manually encode characters that QUrl misses
-        # Replace unencoded ampersands with encoded ones
-        encoded_url = encoded_url.replace('&', '%26')
+        # Ampersands in the path are encoded too, since FTP servers treat them literally
+        encoded_url = _encode(parts, _PATH_SAFE.replace('&', ''))
         
         logger.debug(f"URL encoding: {url} -> {encoded_url}")
         return encoded_url
@@ -43,113 +116,135 @@ def ensure_url_encoded(url):
         logger.error(f"Error encoding URL {url}: {e}")
         return None
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def process_url(url):
+    """Encode a URL, check it for server operations and get its display form in one call.
+    
+    Returns (encoded_url, is_valid, display_url); encoded_url is None if the URL can't be used.
+    """
+    encoded_url = ensure_url_encoded(url)
+    if encoded_url is None:
+        return None, False, ""
+    if encoded_url == url.strip():
+        # Nothing needed encoding, so the checks ensure_url_encoded made on this same string
+        # (scheme, host, whitespace) leave only a bare scheme for is_valid_ftp_url to reject
+        is_valid = encoded_url not in ('http://', 'https://', 'ftp://')
+    else:
+        is_valid = is_valid_ftp_url(encoded_url)
+    return encoded_url, is_valid, get_display_url(encoded_url)
+
+def canonicalize_url(url):
+    """The encoded form of a URL typed, pasted, dropped or picked in the browser, or None if it can't be used.
+    
+    Surrounding whitespace is dropped first, so every way of entering the same URL shares one cached result.
+    """
+    encoded_url, is_valid, _ = process_url(url.strip())
+    return encoded_url if is_valid else None
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def is_valid_ftp_url(url):
     """Check if URL is a valid FTP/HTTP URL for server operations."""
     if not url:
         return False
     
+    # Common case: a supported scheme followed by an ordinary host name
+    if _SIMPLE_URL.match(url.strip()):
+        return True
+    
     try:
-        qurl = QUrl(url)
-        scheme = qurl.scheme().lower()
-        
-        # Basic validity check
-        if not qurl.isValid():
-            return False
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
         
         # Check supported schemes
-        if scheme not in ['ftp', 'http', 'https']:
+        if scheme not in SUPPORTED_SCHEMES:
             return False
         
         # Additional validation for FTP URLs
         if scheme == 'ftp':
             # Ensure FTP URL has a host
-            if not qurl.host():
+            if not parts.hostname:
                 return False
         
         # Reject URLs that are just scheme without anything else
         if url.strip() in ['http://', 'https://', 'ftp://']:
             return False
         
+        # Whitespace inside the host makes the URL unusable
+        if _has_space(parts.netloc):
+            return False
+        
         return True
         
     except Exception as e:
         logger.error(f"Error validating URL {url}: {e}")
         return False
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def get_display_url(url):
     """Get user-friendly display version of URL (decoded for readability)."""
     if not url:
         return ""
     
+    # Nothing to decode
+    if '%' not in url:
+        return url
+    
     try:
-        qurl = QUrl(url)
-        if not qurl.isValid():
-            return url
-        
-        # Return the toString() version which is user-friendly
-        return qurl.toString()
+        # Decode everything except escapes for %, /, ? and # which would change the URL's meaning
+        pieces = _STRUCTURAL_ESCAPES.split(url)
+        pieces[::2] = [unquote(piece) for piece in pieces[::2]]
+        return ''.join(pieces)
         
     except Exception as e:
         logger.error(f"Error getting display URL for {url}: {e}")
         return url
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def normalize_ftp_url(url):
     """Normalize FTP URL for consistent handling."""
     if not url:
         return None
     
     try:
-        qurl = QUrl(url)
-        if not qurl.isValid():
-            return None
+        parts = urlsplit(url.strip())
         
         # Ensure trailing slash for directories
-        path = qurl.path()
+        path = parts.path
         if not path.endswith('/') and '.' not in path.split('/')[-1]:
-            qurl.setPath(path + '/')
+            parts = parts._replace(path=path + '/')
         
-        return qurl.toEncoded().data().decode('utf-8')
+        return _encode(parts)
         
     except Exception as e:
         logger.error(f"Error normalizing URL {url}: {e}")
         return None
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def extract_filename_from_url(url):
     """Extract filename from URL path."""
     if not url:
         return ""
     
-    try:
-        qurl = QUrl(url)
-        path = qurl.path()
-        if path and '/' in path:
-            return path.split('/')[-1]
-        return ""
-        
-    except Exception as e:
-        logger.error(f"Error extracting filename from URL {url}: {e}")
-        return ""
+    path = _raw_path(url)
+    i = path.rfind('/')
+    return path[i + 1:] if i >= 0 else ""
 
+@lru_cache(maxsize=URL_CACHE_SIZE)
 def is_directory_url(url):
     """Check if URL appears to be a directory (ends with / or has no file extension)."""
     if not url:
         return False
     
-    try:
-        qurl = QUrl(url)
-        path = qurl.path()
-        
-        # If path ends with /, it's a directory
-        if path.endswith('/'):
-            return True
-        
-        # If the last component has no extension, likely a directory
-        if path and '/' in path:
-            last_component = path.split('/')[-1]
-            return '.' not in last_component
-        
-        return False
-        
-    except Exception as e:
-        logger.error(f"Error checking if URL is directory {url}: {e}")
-        return False
+    # A trailing slash with no query or fragment needs no further slicing
+    if url.endswith('/') and '?' not in url and '#' not in url:
+        return True
+    
+    path = _raw_path(url)
+    
+    # If path ends with /, it's a directory
+    if path.endswith('/'):
+        return True
+    
+    # If the last component has no extension, likely a directory
+    i = path.rfind('/')
+    return i >= 0 and '.' not in path[i + 1:]
@@ -2,13 +2,36 @@
 # This module contains utility threads for tasks like calculating file sizes.
 
 import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
 from ftplib import FTP, error_perm
 from PyQt5.QtCore import QThread, pyqtSignal
 
 logger = logging.getLogger(__name__)
 
+_session = None
+_session_lock = threading.Lock()
+
+def http_session():
+    """Return the process-wide requests.Session used for listing and size probes.
+    
+    Reusing it keeps connections alive, so walking one host costs a single TCP/TLS handshake.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
 class SizeCalculator(QThread):
     """A QThread to calculate the total size of a list of files from FTP or HTTP URLs."""
     finished = pyqtSignal(int, dict)
@@ -24,42 +47,75 @@ class SizeCalculator(QThread):
     def run(self):
         total_size, file_sizes_map, processed_count = 0, {}, 0
         total_files = len(self.file_urls)
+        # HTTP files get one HEAD each; FTP files are grouped so each host needs a single login
+        http_urls, ftp_by_host = [], defaultdict(list)
         for url in self.file_urls:
-            if not self._is_running: break
-            try:
-                parsed_url = urlparse(url)
-                size = 0
-                if parsed_url.scheme.lower() in ('http', 'https'):
-                    size = self._get_http_size(url)
-                elif parsed_url.scheme.lower() in ('ftp', ''):
-                    size = self._get_ftp_size(parsed_url)
-                if size >= 0: # Allow 0-byte files
-                    total_size += size
-                    file_sizes_map[url] = size
-            except Exception as e:
-                logger.warning(f"Could not get size for {url}: {e}")
-            processed_count += 1
-            self.progress.emit(processed_count, total_files)
+            parsed_url = urlparse(url)
+            scheme = parsed_url.scheme.lower()
+            if scheme in ('http', 'https'):
+                http_urls.append(url)
+            elif scheme in ('ftp', ''):
+                ftp_by_host[parsed_url.netloc].append((url, parsed_url.path))
+            else:
+                file_sizes_map[url] = 0
+                processed_count += 1
+
+        pool = ThreadPoolExecutor(max_workers=self.config.get('size_concurrency', 16))
+        futures = {}
+        try:
+            # HTTP futures map to their URL; FTP host futures return a list of (url, size)
+            futures = {pool.submit(self._get_http_size, url): url for url in http_urls}
+            futures.update({pool.submit(self._get_ftp_sizes, host, files): None for host, files in ftp_by_host.items()})
+            for future in as_completed(futures):
+                if not self._is_running: break
+                url = futures[future]
+                try:
+                    results = [(url, future.result())] if url else future.result()
+                except Exception as e:
+                    logger.warning(f"Could not get size for {url or 'FTP files'}: {e}")
+                    continue
+                for url, size in results:
+                    if size >= 0: # Allow 0-byte files
+                        total_size += size
+                        file_sizes_map[url] = size
+                    processed_count += 1
+                self.progress.emit(processed_count, total_files)
+        finally:
+            # Probes that haven't started are dropped (shutdown's cancel_futures needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
         if self._is_running:
             self.finished.emit(total_size, file_sizes_map)
 
     def _get_http_size(self, url):
         try:
-            response = requests.head(url, allow_redirects=True, timeout=self.config.get('request_timeout', 10))
+            response = http_session().head(url, allow_redirects=True, timeout=self.config.get('request_timeout', 10))
             response.raise_for_status()
             return int(response.headers.get('content-length', 0))
         except requests.RequestException as e:
             logger.error(f"HTTP size check failed for {url}: {e}")
             return -1 # Indicate error
 
-    def _get_ftp_size(self, parsed_url):
+    def _get_ftp_sizes(self, host, files):
+        """Query the sizes of several (url, path) files on one FTP host over a single connection."""
+        sizes = []
         try:
-            with FTP(parsed_url.netloc, timeout=self.config.get('request_timeout', 10)) as ftp:
+            with FTP(host, timeout=self.config.get('request_timeout', 10)) as ftp:
                 ftp.login()
-                return ftp.size(parsed_url.path)
+                ftp.voidcmd('TYPE I') # Many servers refuse SIZE in ASCII mode
+                for url, path in files:
+                    if not self._is_running: break
+                    try:
+                        sizes.append((url, ftp.size(path)))
+                    except error_perm as e:
+                        logger.error(f"FTP size check failed for {url}: {e}")
+                        sizes.append((url, -1))
         except Exception as e:
-            logger.error(f"FTP size check failed for {parsed_url.geturl()}: {e}")
-            return -1 # Indicate error
+            logger.error(f"FTP size check failed for {host}: {e}")
+        # Anything not answered (connection failure or stop) counts as an error
+        sizes.extend((url, -1) for url, _ in files[len(sizes):])
+        return sizes
 
     def stop(self):
         self._is_running = False
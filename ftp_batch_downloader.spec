@@ -8,6 +8,7 @@ datas = [
     ('servers.json', '.'),              # Server bookmarks
     ('config.json', '.'),               # Application config
     ('resources/icons/favicon.ico', 'resources/icons/'),  # Application icon
+    ('resources/themes', 'resources/themes'),  # Theme stylesheets
     ('requirements.txt', '.'),          # Dependencies info
     
     # Include entire directories if they exist
@@ -2,24 +2,16 @@
 # This is the main entry point for the FTP Batch Downloader application.
 
 import sys
-import os
+from pathlib import Path
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtWidgets import QProgressBar
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
 
-# Before importing our modules, ensure the necessary directories exist.
-# This helps prevent import errors if the script is run from a clean state.
-if not os.path.exists('logs'):
-    os.makedirs('logs')
-if not os.path.exists('config'):
-    os.makedirs('config')
-if not os.path.exists('core'):
-    os.makedirs('core')
-if not os.path.exists('ui'):
-    os.makedirs('ui')
-if not os.path.exists('utils'):
-    os.makedirs('utils')
+# Before importing our modules, ensure the log directory exists: the logger is set up
+# at import time and opens its file with the first record. The config, core, ui and
+# utils packages ship with the source, so there's nothing to create for them.
+Path('logs').mkdir(exist_ok=True)
 
 from ui.main_window import MainWindow
 
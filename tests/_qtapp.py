@@ -0,0 +1,14 @@
+# _qtapp.py
+# Shared QApplication for the test modules, so a whole run creates it only once
+
+import sys
+
+_APP = None
+
+def get_app():
+    """Return the process-wide QApplication, creating it on first use."""
+    global _APP
+    if _APP is None:
+        from PyQt5.QtWidgets import QApplication
+        _APP = QApplication.instance() or QApplication(sys.argv)
+    return _APP
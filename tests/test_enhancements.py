@@ -3,17 +3,19 @@
 
 import sys
 import os
+import shutil
 import unittest
 from unittest.mock import Mock, patch
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QThreadPool
 
 # Add the project root to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from _qtapp import get_app
+
 from core.bookmark_manager import BookmarkManager
 from core.cache_manager import DirectoryCache
-from ui.browser_tab import BrowserTab
+from ui.browser_tab import BrowserTab, HomepageBuilder
 from ui.main_window import MainWindow
 
 class TestEnhancements(unittest.TestCase):
@@ -22,10 +24,24 @@ class TestEnhancements(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up QApplication for GUI tests."""
-        if not QApplication.instance():
-            cls.app = QApplication(sys.argv)
-        else:
-            cls.app = QApplication.instance()
+        cls.app = get_app()
+        cls._main_window = None
+        # Windows left behind by earlier test modules may still get listing errors when events are
+        # pumped here; a modal message box would block the run, so dialogs are not shown
+        cls._show_message = patch('ui.main_window.MainWindow.show_message')
+        cls._show_message.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls._show_message.stop()
+    
+    @property
+    def main_window(self):
+        """A MainWindow shared by the tests in this class, built on first use."""
+        cls = type(self)
+        if cls._main_window is None:
+            cls._main_window = MainWindow()
+        return cls._main_window
     
     def setUp(self):
         """Set up test fixtures."""
@@ -56,6 +72,14 @@ class TestEnhancements(unittest.TestCase):
                 self.assertIsInstance(url, str)
                 self.assertGreater(len(url), 0)
     
+    def test_bookmark_manager_get_bookmarks(self):
+        """Test the flat (server, category, url) view of the bookmarks."""
+        bookmarks = self.bookmark_manager.get_bookmarks()
+        for server, category, url in bookmarks:
+            self.assertEqual(self.bookmark_manager.get_url(server, category), url)
+        total = sum(len(self.bookmark_manager.get_categories(s)) for s in self.bookmark_manager.get_servers())
+        self.assertEqual(len(bookmarks), total)
+    
     def test_bookmark_manager_html_generation(self):
         """Test HTML generation for bookmarks."""
         html = self.bookmark_manager.generate_bookmarks_html()
@@ -85,16 +109,93 @@ class TestEnhancements(unittest.TestCase):
         test_url = "http://example.com/expired"
         test_data = [{"name": "expired.txt", "size": "200", "type": "File"}]
         
-        # Mock expired cache
-        with patch('core.cache_manager.datetime') as mock_datetime:
-            from datetime import datetime, timedelta
-            mock_datetime.now.return_value = datetime.now() - timedelta(hours=25)
-            self.cache_manager.set(test_url, test_data)
-            
-            # Reset datetime to current
-            mock_datetime.now.return_value = datetime.now()
-            cached_data = self.cache_manager.get(test_url)
-            self.assertIsNone(cached_data)
+        # Write the entry 25 hours in the past, then read it back now
+        clock = {"now": 1_700_000_000.0}
+        cache = DirectoryCache("test_cache", time_source=lambda: clock["now"])
+        cache.set(test_url, test_data)
+        
+        clock["now"] += 25 * 3600
+        cached_data = cache.get(test_url)
+        self.assertIsNone(cached_data)
+    
+    def test_cache_manager_clear_expired(self):
+        """Test that expiry is driven by the cache file's modification time."""
+        fresh_url = "http://example.com/fresh"
+        stale_url = "http://example.com/stale"
+        self.cache_manager.set(fresh_url, [{"name": "fresh.txt"}])
+        self.cache_manager.set(stale_url, [{"name": "stale.txt"}])
+
+        # Backdate the stale entry past the 24 hour window
+        stale_file = os.path.join("test_cache", self.cache_manager._get_cache_key(stale_url))
+        old_time = os.path.getmtime(stale_file) - 25 * 3600
+        os.utime(stale_file, (old_time, old_time))
+
+        stats = self.cache_manager.get_cache_stats()
+        self.assertEqual(stats['valid_files'], 1)
+        self.assertEqual(stats['expired_files'], 1)
+
+        self.cache_manager.clear_expired()
+        self.assertFalse(os.path.exists(stale_file))
+        self.assertIsNotNone(self.cache_manager.get(fresh_url))
+
+    def test_cache_manager_validators(self):
+        """Test that ETag/Last-Modified are kept and expired entries stay available for revalidation."""
+        test_url = "http://example.com/page/"
+        test_data = [{"name": "page.txt", "size": "1", "type": "File"}]
+        self.cache_manager.set(test_url, test_data, etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+        cache_file = os.path.join("test_cache", self.cache_manager._get_cache_key(test_url))
+        old_time = os.path.getmtime(cache_file) - 25 * 3600
+        os.utime(cache_file, (old_time, old_time))
+
+        entry = self.cache_manager.get_entry(test_url)
+        self.assertEqual(entry['content'], test_data)
+        self.assertEqual(entry['etag'], '"abc"')
+        self.assertEqual(entry['last_modified'], "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.assertIsNone(self.cache_manager.get_entry("http://example.com/missing/"))
+
+    def test_saved_settings_and_bookmarks_keep_file_layout(self):
+        """Test that saving the settings and bookmark files keeps their indentation and characters."""
+        import tempfile
+        from config.manager import ConfigManager
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        config = ConfigManager(os.path.join(folder, 'config.json'))
+        config.save_settings({'theme_name': 'Dark'})
+        with open(config.config_path) as f:
+            self.assertEqual(f.read(), '{\n    "theme_name": "Dark"\n}')
+        
+        bookmarks = BookmarkManager(os.path.join(folder, 'servers.json'))
+        bookmarks.servers = {'Caf\u00e9': {'Films': 'http://example.com/'}}
+        bookmarks.save_bookmarks()
+        with open(bookmarks.servers_file, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '{\n  "Caf\u00e9": {\n    "Films": "http://example.com/"\n  }\n}')
+    
+    def test_deferred_save_coalesces_changes(self):
+        """Test that several changes lead to one save, and a flush with nothing pending saves nothing."""
+        from core._deferred_save import DeferredSave
+        save = Mock()
+        pending = DeferredSave(save, delay=60)
+        pending.mark_dirty()
+        pending.mark_dirty()
+        pending.flush()
+        pending.flush()
+        save.assert_called_once_with()
+    
+    def test_memory_cache_lru_and_ttl(self):
+        """Test that the in-process cache evicts least recently used entries and expires old ones."""
+        from core.cache_manager import MemoryCache
+        cache = MemoryCache(maxsize=2, ttl=60)
+        cache.set("a", [1])
+        cache.set("b", [2])
+        cache.get("a")
+        cache.set("c", [3])
+        self.assertEqual(cache.get("a"), [1])
+        self.assertIsNone(cache.get("b"))
+        
+        expired = MemoryCache(maxsize=2, ttl=0)
+        expired.set("a", [1])
+        self.assertIsNone(expired.get("a"))
     
     def test_cache_manager_stats(self):
         """Test cache statistics."""
@@ -106,6 +207,15 @@ class TestEnhancements(unittest.TestCase):
         self.assertIn('total_size_bytes', stats)
         self.assertIn('total_size_mb', stats)
     
+    def test_listing_size_parsing(self):
+        """Test parsing of autoindex size columns."""
+        from core.lister import parse_listing_size
+        self.assertEqual(parse_listing_size("12345"), 12345)
+        self.assertEqual(parse_listing_size("1.5K"), 1536)
+        self.assertEqual(parse_listing_size("2G"), 2 * 1024 ** 3)
+        self.assertIsNone(parse_listing_size("-"))
+        self.assertIsNone(parse_listing_size("01-Jan-2024"))
+    
     def test_browser_tab_initialization(self):
         """Test that BrowserTab initializes correctly."""
         browser_tab = BrowserTab()
@@ -114,9 +224,120 @@ class TestEnhancements(unittest.TestCase):
         self.assertIsNotNone(browser_tab.browser_view)
         self.assertIsNotNone(browser_tab.address_bar)
     
+    def test_browser_tabs_share_web_profile(self):
+        """Test that browser tabs run their pages in one shared profile."""
+        first, second = BrowserTab(), BrowserTab()
+        self.assertIs(first.browser_view.page().profile(), second.browser_view.page().profile())
+    
+    def test_browser_tab_builds_homepage_in_background(self):
+        """Test that the bookmark homepage is delivered to the tab from the homepage pool."""
+        browser_tab = BrowserTab()
+        self.assertIsNot(HomepageBuilder.pool(), QThreadPool.globalInstance())
+        self.assertTrue(HomepageBuilder.pool().waitForDone(5000))
+        self.app.processEvents()
+        self.assertIsNone(browser_tab._homepage_builder)
+        self.assertIn('FTP Server Bookmarks', browser_tab._homepage_html)
+        self.assertEqual(browser_tab.address_bar.text(), "Bookmarks Homepage")
+    
+    def test_browser_tab_caches_url_info(self):
+        """Test that the encoded URL is worked out when the page changes, not on click."""
+        from PyQt5.QtCore import QUrl
+        from PyQt5.QtTest import QTest
+        browser_tab = BrowserTab()
+        qurl = QUrl("http://example.com/My Movies/")
+        browser_tab.on_url_changed(QUrl("http://example.com/redirect"))
+        browser_tab.on_url_changed(qurl)
+        QTest.qWait(BrowserTab.URL_CHANGE_DELAY_MS + 50)
+        self.assertEqual(browser_tab.address_bar.text(), "http://example.com/My Movies/")
+        with patch.object(browser_tab.browser_view, 'url', return_value=QUrl(qurl)), \
+             patch('ui.browser_tab.process_url') as process:
+            self.assertEqual(browser_tab.get_encoded_url(), "http://example.com/My%20Movies/")
+            process.assert_not_called()
+    
+    def test_downloads_tab_parse_size(self):
+        """Test parsing of the size strings shown in the downloads table."""
+        from ui.downloads_tab import parse_size
+        self.assertEqual(parse_size("1.50 MB"), int(1.5 * 1024 ** 2))
+        self.assertEqual(parse_size("1,024 KB"), 1024 * 1024)
+        self.assertEqual(parse_size("512"), 512)
+        self.assertEqual(parse_size("0 B"), 0)
+        self.assertEqual(parse_size("-"), 0)
+        self.assertEqual(parse_size("unknown"), 0)
+    
+    def test_downloads_tab_reuses_rows(self):
+        """Test that refreshing the downloads table updates existing rows in place."""
+        from ui.downloads_tab import DownloadsTab, DownloadRow
+        def row(progress, status='Downloading'):
+            return DownloadRow(file_name='a.bin', status=status, progress=progress, size='1.0 MB',
+                               file_path='/tmp/a.bin', eta_seconds=None, can_pause=status == 'Downloading',
+                               can_resume=status == 'Paused', can_cancel=True)
+        tab = DownloadsTab()
+        tab.update_downloads([row(10)], [], [], [])
+        tab._refresh_ui()
+        progress_bar = tab.active_table.cellWidget(0, 2)
+        actions_widget = tab.active_table.cellWidget(0, 5)
+        
+        tab.update_downloads([row(60, 'Paused')], [], [], [])
+        tab._refresh_ui()
+        self.assertIs(tab.active_table.cellWidget(0, 2), progress_bar)
+        self.assertEqual(progress_bar.value(), 60)
+        self.assertEqual(tab.active_table.item(0, 1).text(), 'Paused')
+        self.assertIs(tab.active_table.cellWidget(0, 5), actions_widget)
+        
+        resumed = []
+        tab.resume_download.connect(resumed.append)
+        pause_btn, resume_btn, cancel_btn = tab._action_buttons_by_row[0]
+        self.assertTrue(pause_btn.isHidden())
+        resume_btn.click()
+        self.assertEqual(resumed, [0])
+    
+    def test_downloads_tab_formats_eta(self):
+        """Test that the ETA reported with a download is shown and kept while it is paused."""
+        from dataclasses import replace
+        from ui.downloads_tab import DownloadsTab, DownloadRow
+        row = DownloadRow(file_name='a.bin', status='Downloading', progress=50, size='1.0 MB',
+                          file_path='/tmp/a.bin', eta_seconds=125, can_pause=True, can_resume=False, can_cancel=True)
+        tab = DownloadsTab()
+        tab.update_downloads([row], [], [], [])
+        tab._refresh_ui()
+        self.assertEqual(tab.active_table.item(0, 4).text(), "2m 5s")
+        
+        tab.update_downloads([replace(row, status='Paused', eta_seconds=None)], [], [], [])
+        tab._refresh_ui()
+        self.assertEqual(tab.active_table.item(0, 4).text(), "2m 5s")
+    
+    def test_downloads_tab_history_views(self):
+        """Test that history tabs are filled when shown and report clicks on their buttons."""
+        from ui.downloads_tab import DownloadsTab, DownloadRow
+        done = DownloadRow(file_name='a.bin', status='Completed', progress=100, size='1.0 MB', file_path='/tmp/a.bin',
+                           eta_seconds=None, can_pause=False, can_resume=False, can_cancel=False)
+        tab = DownloadsTab()
+        tab.update_downloads([], [done], [], [])
+        tab._refresh_ui()
+        self.assertEqual(tab.completed_model.rowCount(), 0)
+        
+        tab.tabs.setCurrentWidget(tab.completed_tab)
+        self.assertEqual(tab.completed_model.rowCount(), 1)
+        self.assertEqual(tab.completed_model.index(0, 0).data(), 'a.bin')
+        opened = []
+        tab.open_in_explorer.connect(opened.append)
+        tab.completed_table.itemDelegateForColumn(2).clicked.emit(0)
+        self.assertEqual(opened, ['/tmp/a.bin'])
+    
+    def test_downloads_tab_disk_space_cache(self):
+        """Test that free space is looked up once per drive within the cache window."""
+        from collections import namedtuple
+        from ui.downloads_tab import DownloadsTab
+        usage = namedtuple('usage', 'total used free')(100, 50, 50)
+        tab = DownloadsTab()
+        with patch('ui.downloads_tab.shutil.disk_usage', return_value=usage) as disk_usage:
+            self.assertEqual(tab.check_disk_space('/data/a.bin', 10), (True, 50))
+            self.assertEqual(tab.check_disk_space('/data/b.bin', 80), (False, 50))
+        self.assertEqual(disk_usage.call_count, 1)
+    
     def test_main_window_initialization(self):
         """Test that MainWindow initializes with all tabs."""
-        main_window = MainWindow()
+        main_window = self.main_window
         self.assertIsInstance(main_window, MainWindow)
         
         # Check that all tabs are present
@@ -132,6 +353,285 @@ class TestEnhancements(unittest.TestCase):
         for expected_tab in expected_tabs:
             self.assertIn(expected_tab, tab_names)
     
+    def test_main_window_add_tree_items_batch(self):
+        """Test that a listing batch is attached under the right parents and checks cascade."""
+        main_window = self.main_window
+        model = main_window.tree_model
+        model.clear()
+        def entry(path, type_, size='-'):
+            return {'name': os.path.basename(path.rstrip('/')), 'path': path, 'size': size,
+                    'type': type_, 'modified': '', 'full_url': 'http://example.com' + path}
+        main_window.add_tree_items([
+            entry('/pub/dir/', 'Directory'),
+            entry('/pub/a.txt', 'File', 10),
+            entry('/pub/dir/b.txt', 'File', 20),
+        ])
+        self.assertEqual(model.rowCount(), 2)
+        directory = model.index(0, 0)
+        self.assertEqual(directory.data(), 'dir')
+        self.assertEqual(model.rowCount(directory), 1)
+        self.assertEqual(model.index(0, 0, directory).data(Qt.UserRole), 'http://example.com/pub/dir/b.txt')
+        self.assertEqual(main_window.listed_sizes['http://example.com/pub/a.txt'], 10)
+        
+        model.setData(directory, Qt.Checked, Qt.CheckStateRole)
+        self.assertEqual(model.index(0, 0, directory).data(Qt.CheckStateRole), Qt.Checked)
+        self.assertEqual(model.checked_urls(), ['http://example.com/pub/dir/b.txt'])
+        model.setData(model.index(0, 0, directory), Qt.Unchecked, Qt.CheckStateRole)
+        self.assertEqual(model.checked_urls(), [])
+        model.clear()
+        main_window.listed_sizes.clear()
+    
+    def test_lister_items_carry_parent_path(self):
+        """Test that listed items name the directory they belong in, so the tree needs no path parsing."""
+        from core.lister import DirectoryLister
+        lister = DirectoryLister("ftp://example.com/pub/", {})
+        items = []
+        lister._parse_mlsd_listing('/', [('pub', {'type': 'dir'})], items)
+        lister._parse_mlsd_listing('/pub/', [('a.txt', {'type': 'file', 'size': '10'})], items)
+        self.assertEqual([(item['path'], item['parent']) for item in items], [('/pub', '/'), ('/pub/a.txt', '/pub')])
+        
+        model = self.main_window.tree_model
+        model.clear()
+        model.add_items(items)
+        pub = model.index(0, 0)
+        self.assertEqual(model.rowCount(pub), 1)
+        self.assertEqual(model.index(0, 0, pub).data(), 'a.txt')
+    
+    def test_cancelled_ftp_listing_stops_fetching(self):
+        """Test that directories still queued when an FTP listing is cancelled are never fetched."""
+        from core.lister import DirectoryLister
+        lister = DirectoryLister("ftp://example.com/", {'ftp_pool_size': 1})
+        fetched = []
+        def mlsd(path):
+            fetched.append(path)
+            if path == '/':
+                return [(name, {'type': 'dir'}) for name in ('a', 'b', 'c')]
+            lister.cancel()
+            return []
+        with patch('core.lister.FTP') as ftp:
+            ftp.return_value.mlsd.side_effect = mlsd
+            lister._list_ftp('/')
+        self.assertEqual(fetched, ['/', '/a'])
+    
+    def test_cancelled_http_listing_stops_fetching(self):
+        """Test that pages still queued when an HTTP listing is cancelled are never requested."""
+        from core.lister import DirectoryLister
+        lister = DirectoryLister("http://example.com/", {'http_concurrency': 1})
+        requested = []
+        def links(response):
+            requested.append(response.url)
+            if response.url == "http://example.com/":
+                return [(name + '/', name, None) for name in ('a', 'b', 'c')]
+            lister.cancel()
+            return []
+        def get(url, **kwargs):
+            response = Mock(url=url, status_code=200, headers={})
+            response.__enter__ = Mock(return_value=response)
+            response.__exit__ = Mock(return_value=False)
+            return response
+        with patch('core.lister.http_session') as session, patch('core.lister._read_links', side_effect=links):
+            session.return_value.get.side_effect = get
+            lister._list_http(lister.url)
+        self.assertEqual(requested, ["http://example.com/", "http://example.com/a/"])
+    
+    def test_http_listing_replays_unchanged_pages_under_its_own_root(self):
+        """Test that a page confirmed unchanged (304) is listed from cached links relative to the current root."""
+        import tempfile
+        from core.lister import DirectoryLister
+        pages = {"http://h/a/": [('b/', 'b', None)], "http://h/a/b/": [('x.bin', 'x.bin', 10)]}
+        page_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, page_dir)
+        requests_made = []
+        def get(url, headers=None, **kwargs):
+            requests_made.append((url, 'If-None-Match' in headers))
+            status = 304 if 'If-None-Match' in headers else 200
+            response = Mock(url=url, status_code=status, headers={'ETag': '"v1"'})
+            response.__enter__ = Mock(return_value=response)
+            response.__exit__ = Mock(return_value=False)
+            return response
+        def list_root(url):
+            lister = DirectoryLister(url, {})
+            lister.page_cache = DirectoryCache(page_dir)
+            return lister._list_http(url)
+        with patch('core.lister.http_session') as session, \
+             patch('core.lister._read_links', side_effect=lambda response: pages[response.url]):
+            session.return_value.get.side_effect = get
+            list_root("http://h/a/b/")
+            items = list_root("http://h/a/")
+        self.assertIn(("http://h/a/b/", True), requests_made)
+        self.assertEqual([(item['path'], item['parent']) for item in items], [('b', ''), ('b/x.bin', 'b')])
+    
+    def test_lister_cache_is_kept_per_listing_depth(self):
+        """Test that a listing cached on disk at one depth is not served for another depth."""
+        import tempfile
+        from core.lister import DirectoryLister
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        url = "http://example.com/depths/"
+        def listing(depth, fetched):
+            lister = DirectoryLister(url, {'listing_depth': depth})
+            lister.cache = DirectoryCache(cache_dir)
+            received = []
+            lister.item_found_batch.connect(received.extend)
+            with patch.object(lister, '_list_http', return_value=fetched):
+                lister.run()
+            return received
+        # The walk is patched out, so only listings served from the cache reach the signal
+        deep = [{'name': 'deep.txt', 'path': 'a/deep.txt'}]
+        listing(3, deep)
+        DirectoryLister._shared_cache.clear()
+        self.assertEqual(listing(1, [{'name': 'a', 'path': 'a'}]), [])
+        DirectoryLister._shared_cache.clear()
+        self.assertEqual(listing(3, []), deep)
+    
+    def test_lister_runs_on_listing_pool(self):
+        """Test that a lister runs on its own reusable pool and delivers items through its signals."""
+        from core.lister import DirectoryLister
+        url = "http://example.com/pooled/"
+        items = [{'name': 'a.txt', 'size': 10, 'type': 'File', 'modified': '-', 'path': 'a.txt',
+                  'parent': '', 'full_url': url + 'a.txt'}]
+        DirectoryLister._shared_cache.set((url, 3), items)
+        lister = DirectoryLister(url, {})
+        received, finished = [], []
+        lister.item_found_batch.connect(received.extend)
+        lister.finished.connect(lambda: finished.append(True))
+        lister.start()
+        self.assertTrue(DirectoryLister.pool().waitForDone(5000))
+        self.app.processEvents()
+        self.assertEqual(received, items)
+        self.assertTrue(finished)
+        self.assertIsNot(DirectoryLister.pool(), QThreadPool.globalInstance())
+    
+    def test_download_manager_runs_on_its_own_pool(self):
+        """Test that downloads get a dedicated pool sized by the setting, leaving the global pool alone."""
+        global_size = QThreadPool.globalInstance().maxThreadCount()
+        manager = self.main_window.download_manager
+        self.assertIsNot(manager.pool, QThreadPool.globalInstance())
+        self.assertEqual(manager.pool.maxThreadCount(), manager.config.get('max_concurrent_downloads', 4))
+        self.assertEqual(QThreadPool.globalInstance().maxThreadCount(), global_size)
+    
+    def test_browser_tab_status_messages_reach_main_window(self):
+        """Test that BrowserTab status messages are shown in the main window status bar."""
+        self.main_window.browser_tab.show_status_message("URL transferred to downloader", 3000)
+        self.assertEqual(self.main_window.statusBar.currentMessage(), "URL transferred to downloader")
+    
+    def test_main_window_reuses_download_rows(self):
+        """Test that update_downloads_tab rebuilds a row only when its download record changed."""
+        main_window = self.main_window
+        record = {'url': 'http://example.com/a.bin', 'rel_path': 'a.bin', 'file_path': '/tmp/a.bin',
+                  'status': 'Downloading', 'progress': 10, 'size': 2048}
+        sent = []
+        with patch.object(main_window.download_manager, 'get_downloads_by_status', return_value=([record], [], [], [])), \
+             patch.object(main_window.downloads_tab, 'update_downloads', side_effect=lambda *lists: sent.append(lists[0][0])):
+            main_window.update_downloads_tab()
+            main_window.update_downloads_tab()
+            record['progress'] = 20
+            main_window.update_downloads_tab()
+        self.assertIs(sent[0], sent[1])
+        self.assertEqual((sent[0].file_name, sent[0].size, sent[0].can_pause), ('a.bin', '2.00 KB', True))
+        self.assertEqual(sent[2].progress, 20)
+
+    def test_standard_icons_are_shared(self):
+        """Test that a standard icon is looked up once and reused by every caller."""
+        from PyQt5.QtWidgets import QStyle
+        from ui.icons import standard_icon
+        self.assertIs(standard_icon(QStyle.SP_MediaPause), standard_icon(QStyle.SP_MediaPause))
+    
+    def test_main_window_open_in_explorer(self):
+        """Test that the folder holding a downloaded file is opened through Qt."""
+        with patch('ui.main_window.QDesktopServices.openUrl') as open_url:
+            self.main_window.open_in_explorer(os.path.abspath(__file__))
+            self.main_window.open_in_explorer('/no/such/file.bin')
+        open_url.assert_called_once()
+        self.assertEqual(open_url.call_args[0][0].toLocalFile(), os.path.dirname(os.path.abspath(__file__)))
+    
+    def test_main_window_loads_log_in_chunks(self):
+        """Test that the log viewer shows the whole file, read in one go or with lines straddling chunks."""
+        import tempfile
+        from PyQt5.QtWidgets import QPlainTextEdit
+        lines = [f"2024-01-01 - app - INFO - line {i}" for i in range(50)]
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as f:
+            f.write("\n".join(lines) + "\n")
+        self.addCleanup(os.remove, f.name)
+        log_view = QPlainTextEdit()
+        with patch.object(MainWindow, 'LOG_READ_CHUNK', 100), patch.object(MainWindow, 'LOG_SINGLE_READ_MAX', 0):
+            self.main_window._load_log(log_view, f.name)
+        self.assertEqual(log_view.toPlainText(), "\n".join(lines))
+        
+        # Small files are read in one go and shown the same way
+        log_view = QPlainTextEdit()
+        self.main_window._load_log(log_view, f.name)
+        self.assertEqual(log_view.toPlainText(), "\n".join(lines))
+    
+    def test_main_window_debounces_settings_changes(self):
+        """Test that a burst of spinbox changes stores only the last value."""
+        main_window = self.main_window
+        with patch.object(main_window.config_manager, 'set') as config_set:
+            for value in (5, 6, 7):
+                main_window.settings_tab.concurrent_changed.emit(value)
+            self.assertTrue(main_window._cfg_timer.isActive())
+            config_set.assert_not_called()
+            main_window._apply_pending_cfg()
+        config_set.assert_called_once_with("max_concurrent_downloads", 7)
+    
+    def test_main_window_downloads_tab_row_actions(self):
+        """Test that row buttons in the downloads tab reach the download manager with the row's URL."""
+        main_window = self.main_window
+        active = [{'url': 'http://example.com/a.bin'}, {'url': 'http://example.com/b.bin'}]
+        with patch.object(main_window.download_manager, 'get_downloads_by_status', return_value=(active, [], [], [])), \
+             patch.object(main_window.download_manager, 'pause_file') as pause_file, \
+             patch.object(main_window.download_manager, 'cancel_file') as cancel_file:
+            main_window.downloads_tab.pause_download.emit(1)
+            main_window.downloads_tab.cancel_download.emit(5)
+        pause_file.assert_called_once_with('http://example.com/b.bin')
+        cancel_file.assert_not_called()
+    
+    def test_format_bytes(self):
+        """Test byte counts are formatted with the largest whole unit."""
+        from ui.main_window import format_bytes
+        self.assertEqual(format_bytes(0), "0 B")
+        self.assertEqual(format_bytes(1023), "1023.00 B")
+        self.assertEqual(format_bytes(1536), "1.50 KB")
+        self.assertEqual(format_bytes(1048575), "1024.00 KB")
+        self.assertEqual(format_bytes(5 * 2 ** 40), "5.00 TB")
+        self.assertEqual(format_bytes(2 ** 52), "4096.00 TB")
+
+    def test_main_window_coalesces_progress_updates(self):
+        """Test that progress signals only reach the status bar on the next flush, newest value first."""
+        main_window = self.main_window
+        main_window.on_size_calc_progress(1, 10)
+        main_window.on_overall_progress(1024, 4096)
+        main_window.on_overall_progress(2048, 4096)
+        self.assertTrue(main_window._ui_flush_timer.isActive())
+        main_window._flush_ui()
+        self.assertEqual(main_window.statusBar.currentMessage(), "Downloading... 2.00 KB / 4.00 KB")
+        main_window._flush_ui()
+        self.assertFalse(main_window._ui_flush_timer.isActive())
+
+    def test_settings_tab_emits_only_changes(self):
+        """Test that the settings tab reports a theme only when it differs, and typed numbers once committed."""
+        from ui.settings_tab import SettingsTab
+        tab = SettingsTab(4, 3, 'Dark')
+        themes = []
+        tab.theme_changed.connect(themes.append)
+        tab._on_theme_changed('Dark')
+        tab.theme_combo.setCurrentText('Light')
+        tab._on_theme_changed('Light')
+        self.assertEqual(themes, ['Light'])
+        self.assertFalse(tab.concurrent_spinbox.keyboardTracking())
+        self.assertFalse(tab.depth_spinbox.keyboardTracking())
+    
+    def test_main_window_apply_theme(self):
+        """Test that themes are loaded from resources/themes and applied to the application."""
+        main_window = self.main_window
+        theme_name = main_window.config_manager.get("theme_name", "Colorful")
+        main_window.apply_theme("Dark")
+        self.assertIn("QMainWindow { background: #181818; }", self.app.styleSheet())
+        with patch.object(self.app, 'setStyleSheet') as set_style_sheet:
+            main_window.apply_theme("Dark")
+        set_style_sheet.assert_not_called()
+        main_window.apply_theme(theme_name)
+    
     def test_favicon_loading(self):
         """Test that favicon can be loaded."""
         from PyQt5.QtGui import QIcon
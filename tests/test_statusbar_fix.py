@@ -3,16 +3,17 @@
 
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
 
 # Add the project root to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from _qtapp import get_app
+
 def test_statusbar_fix():
     """Test that the statusBar fix prevents TypeError."""
     try:
         # Initialize QApplication
-        app = QApplication(sys.argv)
+        app = get_app()
         
         # Import and create main window
         from ui.main_window import MainWindow
@@ -35,9 +36,6 @@ def test_statusbar_fix():
     except Exception as e:
         print(f"⚠️  Other error occurred (not related to statusBar): {e}")
         return True  # This is acceptable as it's not the statusBar error
-    finally:
-        if 'app' in locals():
-            app.quit()
 
 if __name__ == '__main__':
     success = test_statusbar_fix()
@@ -9,6 +9,9 @@ import traceback
 
 # Add the project root to the path
 sys.path.insert(0, os.path.abspath('.'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _qtapp import get_app
 
 def test_statusbar_access():
     """Test that statusBar is accessed correctly."""
@@ -16,11 +19,10 @@ def test_statusbar_access():
         print("Testing statusBar fix...")
         
         # Import after path setup
-        from PyQt5.QtWidgets import QApplication
         from ui.main_window import MainWindow
         
         # Create application
-        app = QApplication(sys.argv)
+        app = get_app()
         
         # Create main window
         window = MainWindow()
@@ -43,11 +45,6 @@ def test_statusbar_access():
         print(f"⚠️  Other error occurred: {e}")
         traceback.print_exc()
         return False
-    finally:
-        try:
-            app.quit()
-        except:
-            pass
 
 if __name__ == "__main__":
     success = test_statusbar_access()
@@ -5,16 +5,18 @@ import sys
 import os
 import unittest
 from unittest.mock import Mock, patch, MagicMock
-from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt, QUrl
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 
 # Add the project root to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from _qtapp import get_app
+
 from core.url_utils import (
     ensure_url_encoded, is_valid_ftp_url, get_display_url,
-    normalize_ftp_url, extract_filename_from_url, is_directory_url
+    normalize_ftp_url, extract_filename_from_url, is_directory_url, process_url,
+    canonicalize_url
 )
 
 class TestURLEncodingFix(unittest.TestCase):
@@ -23,10 +25,7 @@ class TestURLEncodingFix(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up QApplication for GUI tests."""
-        if not QApplication.instance():
-            cls.app = QApplication(sys.argv)
-        else:
-            cls.app = QApplication.instance()
+        cls.app = get_app()
     
     def test_ensure_url_encoded(self):
         """Test URL encoding functionality."""
@@ -188,6 +187,23 @@ class TestURLEncodingFix(unittest.TestCase):
         display = get_display_url(encoded)
         self.assertIn(" ", display)
     
+    def test_process_url(self):
+        """Test that process_url matches the separate encode/validate/display helpers."""
+        for url in ["http://example.com/folder with spaces/", "ftp://example.com/a & b/",
+                    "http://", "not-a-url", "mailto:someone@example.com"]:
+            encoded = ensure_url_encoded(url)
+            expected = (encoded, bool(encoded) and is_valid_ftp_url(encoded),
+                        get_display_url(encoded) if encoded else "")
+            self.assertEqual(process_url(url), expected)
+    
+    def test_canonicalize_url(self):
+        """Test that canonicalize_url returns the encoded URL, or None when it can't be fetched."""
+        self.assertEqual(canonicalize_url("  http://example.com/folder with spaces/ "),
+                         "http://example.com/folder%20with%20spaces/")
+        self.assertEqual(canonicalize_url("ftp://example.com/pub/"), "ftp://example.com/pub/")
+        self.assertIsNone(canonicalize_url("http://"))
+        self.assertIsNone(canonicalize_url("not-a-url"))
+    
     def test_edge_cases(self):
         """Test edge cases and error conditions."""
         # Test empty/None URLs
@@ -7,6 +7,47 @@ This script checks all instances of statusBar usage in the codebase.
 import os
 import re
 
+# Files to check
+STATUSBAR_FILES = (
+    'ui/main_window.py',
+    'ui/browser_tab.py',
+    'ui/downloads_tab.py',
+    'ui/settings_tab.py',
+)
+
+# statusBar() calls (incorrect) and statusBar property access (correct), searched over whole files
+BAD_STATUSBAR_RE = re.compile(r'\.statusBar\(\)\.showMessage')
+GOOD_STATUSBAR_RE = re.compile(r'\.statusBar\.showMessage')
+
+# Body of handle_browser_url_selected, compiled once; it ends at the next line starting a def,
+# not at the first "def" inside some other word
+METHOD_RE = re.compile(r'^ *def handle_browser_url_selected\(self, url\):(.*?)(?=^ *def |\Z)', re.DOTALL | re.MULTILINE)
+
+# File contents by path, so checks that look at the same file read it from disk once
+_FILE_CACHE = {}
+
+def _read(path):
+    """Return the text of a file, reading it on first use; raises FileNotFoundError if it is missing."""
+    content = _FILE_CACHE.get(path)
+    if content is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = _FILE_CACHE[path] = f.read()
+    return content
+
+def _line_matches(pattern, content):
+    """Yield (line number, line text) once for each line of content that pattern matches."""
+    line_no, pos, last = 1, 0, None
+    for match in pattern.finditer(content):
+        # Count newlines only since the previous match, so numbering stays linear in the file size
+        line_no += content.count('\n', pos, match.start())
+        pos = match.start()
+        if line_no == last:
+            continue
+        last = line_no
+        start = content.rfind('\n', 0, pos) + 1
+        end = content.find('\n', pos)
+        yield line_no, content[start:end if end != -1 else len(content)]
+
 def check_statusbar_usage():
     """Check all Python files for proper statusBar usage."""
     print("🔍 Checking statusBar usage across the codebase...")
@@ -14,37 +55,30 @@ def check_statusbar_usage():
     issues_found = []
     files_checked = 0
     
-    # Files to check
-    python_files = [
-        'ui/main_window.py',
-        'ui/browser_tab.py',
-        'ui/downloads_tab.py',
-        'ui/settings_tab.py'
-    ]
-    
-    for file_path in python_files:
-        if os.path.exists(file_path):
-            files_checked += 1
-            print(f"   📄 Checking {file_path}...")
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
-                
-                # Check for problematic patterns
-                for i, line in enumerate(lines, 1):
-                    # Look for statusBar() calls (incorrect)
-                    if re.search(r'\.statusBar\(\)\.showMessage', line):
-                        issues_found.append({
-                            'file': file_path,
-                            'line': i,
-                            'content': line.strip(),
-                            'issue': 'Uses statusBar() instead of statusBar'
-                        })
-                    
-                    # Look for correct usage (for verification)
-                    if re.search(r'\.statusBar\.showMessage', line):
-                        print(f"      ✅ Line {i}: Correct statusBar usage found")
+    for file_path in STATUSBAR_FILES:
+        # Opening directly covers the existence check; missing files are skipped
+        try:
+            content = _read(file_path)
+        except FileNotFoundError:
+            continue
+        files_checked += 1
+        print(f"   📄 Checking {file_path}...")
+        # Both patterns contain this literal; a plain substring scan rules most files out without the regex engine
+        if '.statusBar' not in content:
+            continue
+        
+        # Look for statusBar() calls (incorrect)
+        for i, line in _line_matches(BAD_STATUSBAR_RE, content):
+            issues_found.append({
+                'file': file_path,
+                'line': i,
+                'content': line.strip(),
+                'issue': 'Uses statusBar() instead of statusBar'
+            })
+        
+        # Look for correct usage (for verification)
+        for i, _ in _line_matches(GOOD_STATUSBAR_RE, content):
+            print(f"      ✅ Line {i}: Correct statusBar usage found")
     
     print(f"\n📊 Summary:")
     print(f"   Files checked: {files_checked}")
@@ -68,20 +102,14 @@ def verify_specific_method():
     print(f"\n🎯 Verifying handle_browser_url_selected method...")
     
     file_path = 'ui/main_window.py'
-    if not os.path.exists(file_path):
+    try:
+        content = _read(file_path)
+    except FileNotFoundError:
         print(f"   ❌ File {file_path} not found")
         return False
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
     # Find the method
-    import re
-    method_match = re.search(
-        r'def handle_browser_url_selected\(self, url\):(.*?)(?=def|\Z)', 
-        content, 
-        re.DOTALL
-    )
+    method_match = METHOD_RE.search(content)
     
     if not method_match:
         print(f"   ❌ Method handle_browser_url_selected not found")
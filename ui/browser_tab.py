@@ -3,27 +3,172 @@
 
 import os
 import logging
+from functools import partial
 from urllib.parse import quote, unquote
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, 
     QComboBox, QToolBar, QLabel, QMessageBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QUrl
+from PyQt5.QtCore import Qt, pyqtSignal, QUrl, QCoreApplication, QTimer, QObject, QRunnable, QThreadPool
 from PyQt5.QtGui import QIcon
-from PyQt5.QtWebEngineWidgets import QWebEngineView
 from core.bookmark_manager import BookmarkManager
-from core.url_utils import ensure_url_encoded, is_valid_ftp_url, get_display_url
+from core.url_utils import process_url, get_display_url
 
 logger = logging.getLogger(__name__)
 
+# QtWebEngine is only loaded when a browser view is built. Qt allows that after the application
+# exists as long as OpenGL contexts are shared, which importing it would otherwise have set here.
+if QCoreApplication.instance() is None:
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+
+_web_profile = None
+
+def _shared_web_profile():
+    """The off-the-record profile every BrowserTab page runs in, created with the first tab."""
+    global _web_profile
+    if _web_profile is None:
+        from PyQt5.QtWebEngineWidgets import QWebEngineProfile, QWebEngineSettings
+        _web_profile = QWebEngineProfile(QCoreApplication.instance())
+        # Directory listings need neither plugins nor WebGL
+        settings = _web_profile.settings()
+        settings.setAttribute(QWebEngineSettings.PluginsEnabled, False)
+        settings.setAttribute(QWebEngineSettings.WebGLEnabled, False)
+    return _web_profile
+
+# Schemes the downloader can list and fetch
+_VALID_SCHEMES = frozenset({'ftp', 'http', 'https'})
+
+# Stylesheets are module constants so every tab shares the same strings. The "Use This Link"
+# button is styled by object name from the tab's sheet, so it needs no stylesheet of its own.
+_USE_LINK_QSS = """
+    QPushButton#useLinkBtn {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #4CAF50, stop:1 #8BC34A);
+        color: white;
+        border-radius: 6px;
+        font-weight: bold;
+        padding: 6px 12px;
+    }
+    QPushButton#useLinkBtn:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #45a049, stop:1 #7CB342);
+    }
+"""
+
+_BROWSER_TAB_QSS = """
+    QPushButton {
+        border-radius: 6px;
+        padding: 6px 12px;
+        font-size: 12px;
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #2196F3, stop:1 #FF9800);
+        color: #fff;
+        font-weight: bold;
+        border: none;
+    }
+    QPushButton:hover {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1976D2, stop:1 #F57C00);
+    }
+    QPushButton:pressed {
+        background: #FF9800;
+    }
+    QLineEdit {
+        border: 2px solid #2196F3;
+        border-radius: 6px;
+        padding: 6px 8px;
+        font-size: 12px;
+        background: #393E6B;
+        color: #fff;
+    }
+    QComboBox {
+        border: 2px solid #2196F3;
+        border-radius: 6px;
+        padding: 4px 8px;
+        font-size: 12px;
+        background: #393E6B;
+        color: #fff;
+    }
+    QComboBox::drop-down {
+        border: none;
+    }
+    QComboBox::down-arrow {
+        image: none;
+        border-left: 5px solid transparent;
+        border-right: 5px solid transparent;
+        border-top: 5px solid #fff;
+    }
+"""
+
+# Shown while the bookmark homepage is being built
+_HOMEPAGE_PLACEHOLDER_HTML = """
+<!DOCTYPE html>
+<html><body style="background: #2C2F48; color: #fff; font-family: 'Segoe UI', sans-serif;">
+<h2 style="text-align: center; margin-top: 40px;">Loading bookmarks...</h2>
+</body></html>
+"""
+
+class HomepageBuilderSignals(QObject):
+    """Signals for a HomepageBuilder, which as a QRunnable cannot define its own."""
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+class HomepageBuilder(QRunnable):
+    """Generates the bookmark homepage HTML on the homepage pool."""
+    
+    # Builds get their own thread so busy work on the global pool never delays the first page
+    _pool = None
+    POOL_SIZE = 1
+    
+    def __init__(self, bookmark_manager):
+        super().__init__()
+        self.signals = HomepageBuilderSignals()
+        self.bookmark_manager = bookmark_manager
+    
+    @classmethod
+    def pool(cls):
+        """The thread pool homepages are built on; its thread is kept and reused between tabs."""
+        if cls._pool is None:
+            cls._pool = QThreadPool()
+            cls._pool.setMaxThreadCount(cls.POOL_SIZE)
+        return cls._pool
+    
+    def start(self):
+        """Queue the build on the homepage pool."""
+        self.pool().start(self)
+    
+    def run(self):
+        try:
+            html_content = self.bookmark_manager.generate_bookmarks_html()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(html_content)
+
 class BrowserTab(QWidget):
     """Browser tab with web view and bookmark functionality."""
     
+    # Redirects can change the URL several times in a row; only the last one within this window is shown
+    URL_CHANGE_DELAY_MS = 50
+    
     url_selected = pyqtSignal(str)  # Signal emitted when "Use This Link" is clicked
+    status_message = pyqtSignal(str, int)  # message, duration in ms; shown by the main window
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.bookmark_manager = BookmarkManager()
+        self._homepage_html = None  # Bookmark HTML currently loaded in the view
+        self._homepage_builder = None  # Pending HomepageBuilder for the first homepage load
+        self._shown_server = None  # Server whose categories the category dropdown holds
+        self._url_info = None  # (QUrl, process_url result) for the page last seen by on_url_changed
+        self._pending_qurl = None  # Latest URL waiting for the url change timer
+        self._url_timer = QTimer(self)
+        self._url_timer.setSingleShot(True)
+        self._url_timer.setInterval(self.URL_CHANGE_DELAY_MS)
+        self._url_timer.timeout.connect(self._apply_url_change)
+        self._status_bar = None  # Main window status bar, looked up on first message
+        # The bookmark set is fixed for the session, so the dropdowns read from snapshots
+        self._categories_by_server = {s: [] for s in self.bookmark_manager.get_servers()}
+        self._url_by_pair = {}
+        for server, category, url in self.bookmark_manager.get_bookmarks():
+            self._categories_by_server[server].append(category)
+            self._url_by_pair[(server, category)] = url
         self.setup_ui()
         self.setup_connections()
         self.load_homepage()
@@ -51,8 +196,7 @@ class BrowserTab(QWidget):
         
         # Server and category dropdowns
         self.server_dropdown = QComboBox()
-        self.server_dropdown.addItem("Select Server...")
-        self.server_dropdown.addItems(self.bookmark_manager.get_servers())
+        self.server_dropdown.addItems(["Select Server..."] + list(self._categories_by_server))
         self.server_dropdown.setMaximumWidth(150)
         
         self.category_dropdown = QComboBox()
@@ -62,18 +206,7 @@ class BrowserTab(QWidget):
         # Use this link button
         self.use_link_button = QPushButton("📥 Use This Link")
         self.use_link_button.setMaximumWidth(120)
-        self.use_link_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #4CAF50, stop:1 #8BC34A);
-                color: white;
-                border-radius: 6px;
-                font-weight: bold;
-                padding: 6px 12px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #45a049, stop:1 #7CB342);
-            }
-        """)
+        self.use_link_button.setObjectName("useLinkBtn")
         
         # Add widgets to toolbar
         toolbar_layout.addWidget(self.back_button)
@@ -88,53 +221,15 @@ class BrowserTab(QWidget):
         
         layout.addLayout(toolbar_layout)
         
-        # Web view
+        # Web view; importing QtWebEngine starts Chromium, so it waits until a tab is built
+        from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
         self.browser_view = QWebEngineView()
+        # Pages share one in-memory profile instead of each bringing up the default on-disk one
+        self.browser_view.setPage(QWebEnginePage(_shared_web_profile(), self.browser_view))
         layout.addWidget(self.browser_view)
         
         # Apply styling
-        self.setStyleSheet("""
-            QPushButton {
-                border-radius: 6px;
-                padding: 6px 12px;
-                font-size: 12px;
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #2196F3, stop:1 #FF9800);
-                color: #fff;
-                font-weight: bold;
-                border: none;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1976D2, stop:1 #F57C00);
-            }
-            QPushButton:pressed {
-                background: #FF9800;
-            }
-            QLineEdit {
-                border: 2px solid #2196F3;
-                border-radius: 6px;
-                padding: 6px 8px;
-                font-size: 12px;
-                background: #393E6B;
-                color: #fff;
-            }
-            QComboBox {
-                border: 2px solid #2196F3;
-                border-radius: 6px;
-                padding: 4px 8px;
-                font-size: 12px;
-                background: #393E6B;
-                color: #fff;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #fff;
-            }
-        """)
+        self.setStyleSheet(_BROWSER_TAB_QSS + _USE_LINK_QSS)
     
     def setup_connections(self):
         """Set up signal connections."""
@@ -153,46 +248,82 @@ class BrowserTab(QWidget):
     
     def load_homepage(self):
         """Load the bookmark homepage."""
+        if self._homepage_html is None:
+            # The first page is built on the thread pool; show a placeholder until it arrives
+            self.address_bar.setText("Bookmarks Homepage")
+            self.use_link_button.setEnabled(False)  # Disable for homepage
+            if self._homepage_builder is None:
+                self.browser_view.setHtml(_HOMEPAGE_PLACEHOLDER_HTML)
+                builder = HomepageBuilder(self.bookmark_manager)
+                # Queued slots on this widget are dropped if the tab is destroyed first
+                builder.signals.finished.connect(self._on_homepage_built, Qt.QueuedConnection)
+                builder.signals.error.connect(self._on_homepage_error, Qt.QueuedConnection)
+                self._homepage_builder = builder
+                builder.start()
+            return
         try:
+            # The manager caches the generated page, so an unchanged homepage is the same string
+            # and does not need to be handed to the web engine again
             html_content = self.bookmark_manager.generate_bookmarks_html()
-            self.browser_view.setHtml(html_content)
+            if html_content is not self._homepage_html or not self.browser_view.url().toString().startswith("data:"):
+                self.browser_view.setHtml(html_content)
+                self._homepage_html = html_content
             self.address_bar.setText("Bookmarks Homepage")
             self.use_link_button.setEnabled(False)  # Disable for homepage
         except Exception as e:
-            logger.error(f"Error loading homepage: {e}")
-            self.browser_view.setHtml("<h1>Error loading bookmarks</h1>")
-            self.address_bar.setText("Error")
-            self.use_link_button.setEnabled(False)
+            self._on_homepage_error(str(e))
+    
+    def _on_homepage_built(self, html_content):
+        self._homepage_builder = None
+        self._homepage_html = html_content
+        # Leave the view alone if the user navigated away while the page was being built
+        url = self.browser_view.url()
+        if url.isEmpty() or url.scheme() == "data":
+            self.browser_view.setHtml(html_content)
+    
+    def _on_homepage_error(self, message):
+        logger.error(f"Error loading homepage: {message}")
+        self._homepage_builder = None
+        self._homepage_html = None
+        self.browser_view.setHtml("<h1>Error loading bookmarks</h1>")
+        self.address_bar.setText("Error")
+        self.use_link_button.setEnabled(False)
     
     def navigate_to_url(self):
         """Navigate to the URL in the address bar."""
         url = self.address_bar.text().strip()
         if url and url not in ("Bookmarks Homepage", "Error"):
-            if not url.startswith(('http://', 'https://', 'ftp://')):
+            if '://' not in url:
                 url = 'http://' + url
             self.browser_view.setUrl(QUrl(url))
     
     def on_url_changed(self, qurl):
         """Handle URL changes and update UI state."""
-        self.update_address_bar(qurl)
+        self._pending_qurl = QUrl(qurl)
+        self._url_timer.start()
+    
+    def _apply_url_change(self):
+        qurl = self._pending_qurl
+        self._show_url(qurl.toString())
+        # Encode and validate now, so "Use This Link" does not redo it on click
+        self._url_info = (qurl, self._process_qurl(qurl))
         
-        # Enable/disable "Use This Link" button based on URL validity
-        url_string = qurl.toString()
-        if url_string and qurl.scheme() in ['ftp', 'http', 'https']:
-            self.use_link_button.setEnabled(True)
-        else:
-            self.use_link_button.setEnabled(False)
+        # Enable/disable "Use This Link" button based on the URL scheme
+        self.use_link_button.setEnabled(qurl.scheme() in _VALID_SCHEMES)
     
     def update_address_bar(self, qurl):
         """Update the address bar with user-friendly URL display."""
-        url_string = qurl.toString()
+        self._show_url(qurl.toString())
+    
+    def _show_url(self, url_string):
         if url_string == "about:blank":
             return
         elif url_string.startswith("data:"):
             # This is our bookmark homepage
             self.address_bar.setText("Bookmarks Homepage")
         else:
-            # Display user-friendly (decoded) URL for readability
+            # Display user-friendly (decoded) URL for readability; get_display_url is memoized,
+            # so revisiting the same directories costs a cache lookup
             display_url = get_display_url(url_string)
             self.address_bar.setText(display_url)
     
@@ -205,16 +336,18 @@ class BrowserTab(QWidget):
     
     def on_server_changed(self, server_name):
         """Handle server selection change."""
-        if server_name == "Select Server...":
-            self.category_dropdown.clear()
-            self.category_dropdown.addItem("Select Category...")
+        if server_name == self._shown_server:
             return
+        self._shown_server = server_name
+        categories = [] if server_name == "Select Server..." else self._categories_by_server.get(server_name, [])
         
-        # Populate categories for selected server
-        self.category_dropdown.clear()
-        self.category_dropdown.addItem("Select Category...")
-        categories = self.bookmark_manager.get_categories(server_name)
-        self.category_dropdown.addItems(categories)
+        # Refill in one call with signals held back, so listeners see a single change
+        dropdown = self.category_dropdown
+        dropdown.blockSignals(True)
+        dropdown.clear()
+        dropdown.addItems(["Select Category..."] + categories)
+        dropdown.blockSignals(False)
+        dropdown.setCurrentIndex(0)
     
     def on_category_changed(self, category_name):
         """Handle category selection change."""
@@ -223,36 +356,49 @@ class BrowserTab(QWidget):
         
         server_name = self.server_dropdown.currentText()
         if server_name != "Select Server...":
-            url = self.bookmark_manager.get_url(server_name, category_name)
+            url = self._url_by_pair.get((server_name, category_name))
             if url:
                 self.browser_view.setUrl(QUrl(url))
     
     def get_encoded_url(self):
         """Get the current URL with proper percent-encoding for FTP operations."""
+        return self._process_current_url()[0]
+    
+    def _process_current_url(self):
+        """Return (encoded_url, is_valid, display_url) for the page being shown."""
         current_qurl = self.browser_view.url()
-        url_string = current_qurl.toString()
+        if self._url_info is not None and self._url_info[0] == current_qurl:
+            return self._url_info[1]
+        return self._process_qurl(current_qurl)
+    
+    def _process_qurl(self, qurl):
+        # toString() decodes by default; asking Qt for the encoded form means ensure_url_encoded
+        # usually finds nothing left to quote and returns the string as-is
+        url_string = qurl.toString(QUrl.FullyEncoded)
         
         # Handle special cases
         if (url_string == "about:blank" or 
             url_string.startswith("data:") or 
             url_string.startswith("bookmarks://")):
-            return None
+            return None, False, ""
         
-        # Get properly encoded URL
+        # Encode and validate together
         try:
-            encoded_url = ensure_url_encoded(url_string)
-            logger.debug(f"Browser URL encoding: {url_string} -> {encoded_url}")
-            return encoded_url
+            result = process_url(url_string)
+            logger.debug(f"Browser URL encoding: {url_string} -> {result[0]}")
+            return result
         except Exception as e:
             logger.error(f"Error getting encoded URL: {e}")
-            return None
+            return None, False, ""
     
     def use_current_link(self):
         """Emit signal with current URL for use in downloader."""
-        encoded_url = self.get_encoded_url()
+        encoded_url, is_valid, _ = self._process_current_url()
         
-        if encoded_url and is_valid_ftp_url(encoded_url):
-            self.url_selected.emit(encoded_url)
+        if encoded_url and is_valid:
+            # The receiver starts a directory listing; deliver on the next event loop pass so the
+            # click returns and the status message paints first
+            QTimer.singleShot(0, partial(self.url_selected.emit, encoded_url))
             self.show_status_message(f"URL transferred to downloader", 3000)
             logger.info(f"URL transferred to downloader: {encoded_url}")
         elif encoded_url:
@@ -265,13 +411,19 @@ class BrowserTab(QWidget):
     def show_status_message(self, message, duration=3000):
         """Show status message in main window status bar."""
         try:
-            # Find the main window through parent hierarchy
-            widget = self.parent()
-            while widget and not hasattr(widget, 'statusBar'):
-                widget = widget.parent()
+            if self.receivers(self.status_message):
+                self.status_message.emit(message, duration)
+                return
+            # Without a listener, the main window's status bar is found once and reused
+            if self._status_bar is None:
+                widget = self.parent()
+                while widget and not hasattr(widget, 'statusBar'):
+                    widget = widget.parent()
+                if widget:
+                    self._status_bar = widget.statusBar
             
-            if widget and hasattr(widget, 'statusBar'):
-                widget.statusBar.showMessage(message, duration)
+            if self._status_bar is not None:
+                self._status_bar.showMessage(message, duration)
             else:
                 logger.info(f"Status: {message}")
         except Exception as e:
@@ -1,28 +1,130 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QProgressBar, QLabel, QTabWidget, QMessageBox)
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QProgressBar, QLabel, QTabWidget, QMessageBox,
+                             QTableView, QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication, QToolButton)
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QSignalMapper, QAbstractTableModel, QModelIndex, QEvent
 import os
+import re
 import subprocess
 import shutil
 import time
+from dataclasses import dataclass
+from functools import lru_cache
 
+from ui.icons import standard_icon
+
+# "1.50 MB", "1,024 KB", "512" as produced by format_bytes and the size columns
+_SIZE_RE = re.compile(r'^\s*([\d,.]+)\s*([KMGT]?B)?\s*$', re.IGNORECASE)
+_SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3, 'TB': 1024**4}
+
+# The same handful of size strings are parsed on every refresh
+@lru_cache(maxsize=512)
 def parse_size(size_str):
     if not size_str or size_str == '-':
         return 0
-    size_str = size_str.replace(',', '').strip()
-    units = {'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3, 'TB': 1024**4}
-    parts = size_str.split()
-    if len(parts) == 2:
-        num, unit = parts
-        try:
-            return int(float(num) * units[unit])
-        except Exception:
-            return 0
-    try:
+    if size_str.isdigit():
         return int(size_str)
-    except Exception:
+    match = _SIZE_RE.match(size_str)
+    if not match:
+        return 0
+    try:
+        num = float(match.group(1).replace(',', ''))
+    except ValueError:
         return 0
+    unit = match.group(2)
+    return int(num * _SIZE_UNITS[unit.upper()]) if unit else int(num)
+
+@dataclass(frozen=True)
+class DownloadRow:
+    """What the downloads tables show for one download, already formatted for display."""
+    # Written out rather than dataclass(slots=True), which needs Python 3.10; slots rule out
+    # field defaults, so every field is passed when a row is built
+    __slots__ = ('file_name', 'status', 'progress', 'size', 'file_path',
+                 'eta_seconds', 'can_pause', 'can_resume', 'can_cancel')
+    file_name: str
+    status: str
+    progress: int
+    size: str
+    file_path: str
+    eta_seconds: int  # None while unknown
+    can_pause: bool
+    can_resume: bool
+    can_cancel: bool
+
+class DownloadsModel(QAbstractTableModel):
+    """Read-only model over a list of DownloadRows; each column shows one attribute."""
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self._columns = columns  # [(header, attribute)]; an attribute of None shows the header as a button label
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        header, key = self._columns[index.column()]
+        return header if key is None else getattr(self._rows[index.row()], key)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    def row(self, row):
+        return self._rows[row]
+
+    def set_rows(self, rows):
+        """Replace the rows, signalling only the rows that were added, removed or changed."""
+        old_count, new_count = len(self._rows), len(rows)
+        changed = [row for row in range(min(old_count, new_count)) if self._rows[row] != rows[row]]
+        if new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self._rows = list(rows)
+            self.endInsertRows()
+        elif new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            self._rows = list(rows)
+            self.endRemoveRows()
+        else:
+            self._rows = list(rows)
+        if changed:
+            self.dataChanged.emit(self.index(changed[0], 0), self.index(changed[-1], len(self._columns) - 1))
+
+class ButtonDelegate(QStyledItemDelegate):
+    """Paints a push button in every cell of a column and reports the row that was clicked."""
+    clicked = pyqtSignal(int)
+
+    def __init__(self, standard_pixmap, parent=None):
+        super().__init__(parent)
+        self._icon = standard_icon(standard_pixmap)
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data()
+        button.icon = self._icon
+        button.iconSize = option.decorationSize
+        button.state = QStyle.State_Enabled | QStyle.State_Raised
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if option.rect.contains(event.pos()):
+                self.clicked.emit(index.row())
+            return True
+        return event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick)
 
 class DownloadsTab(QWidget):
+    # Updates arriving within this window are drawn in a single refresh
+    REFRESH_DELAY_MS = 100
+    # Free space per drive is reused for this long before asking the OS again
+    DISK_CACHE_TTL = 3.0
+
     # Signals for global actions
     pause_all = pyqtSignal()
     resume_all = pyqtSignal()
@@ -36,15 +138,35 @@ class DownloadsTab(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.last_progress_times = {}  # For ETA calculation
-        self.last_progress_bytes = {}
         self._last_eta = {}  # For persistent ETA display
         self._active_data = ([], [], [], [])
-        self._timer = QTimer(self)
-        self._timer.setInterval(200)
-        self._timer.timeout.connect(self._refresh_ui)
+        self._shown_data = None  # The _active_data last drawn, to skip refreshes that change nothing
+        self._rows = {}  # table -> what each row last displayed, for diffing
+        self._dirty = False  # A refresh is scheduled
+        self._disk_cache = {}  # drive -> (checked_at, free bytes or None)
+        self._warned = set()  # File paths already warned about low disk space
+        self._action_buttons_by_row = []  # Active table: (pause, resume, cancel) buttons per row
+        # Row buttons are created once and mapped to their row, so no per-button closures are needed
+        self._pause_mapper = self._mapper(self.pause_download)
+        self._resume_mapper = self._mapper(self.resume_download)
+        self._cancel_mapper = self._mapper(self.cancel_download)
         self.init_ui()
 
+    def _mapper(self, signal):
+        mapper = QSignalMapper(self)
+        mapper.mappedInt.connect(signal)
+        return mapper
+
+    def _mapped_button(self, text, standard_pixmap, mapper, value):
+        # Tool buttons with shared icons are cheaper to create and style than push buttons
+        button = QToolButton()
+        button.setText(text)
+        button.setIcon(standard_icon(standard_pixmap))
+        button.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        button.clicked.connect(mapper.map)
+        mapper.setMapping(button, value)
+        return button
+
     def init_ui(self):
         layout = QVBoxLayout(self)
         self.tabs = QTabWidget()
@@ -69,141 +191,185 @@ class DownloadsTab(QWidget):
         self.active_layout.addWidget(self.active_table)
         self.tabs.addTab(self.active_tab, "Active")
 
-        # Completed Tab
-        self.completed_tab = QWidget()
-        self.completed_layout = QVBoxLayout(self.completed_tab)
-        self.completed_table = QTableWidget(0, 3)
-        self.completed_table.setHorizontalHeaderLabels(["File Name", "Size", "Open"])
-        self.completed_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.completed_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.completed_layout.addWidget(self.completed_table)
+        # Completed, Failed and Canceled tabs can hold long histories, so they are model-backed views
+        # whose buttons are painted by a delegate rather than created per row
+        self.completed_tab, self.completed_table, self.completed_model = self._history_tab(
+            [("File Name", 'file_name'), ("Size", 'size'), ("Open", None)], QStyle.SP_DirOpenIcon, self._open_completed)
         self.tabs.addTab(self.completed_tab, "Completed")
-
-        # Failed Tab
-        self.failed_tab = QWidget()
-        self.failed_layout = QVBoxLayout(self.failed_tab)
-        self.failed_table = QTableWidget(0, 4)
-        self.failed_table.setHorizontalHeaderLabels(["File Name", "Status", "Size", "Retry"])
-        self.failed_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.failed_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.failed_layout.addWidget(self.failed_table)
+        self.failed_tab, self.failed_table, self.failed_model = self._history_tab(
+            [("File Name", 'file_name'), ("Status", 'status'), ("Size", 'size'), ("Retry", None)], QStyle.SP_BrowserReload,
+            lambda row: self.retry_download.emit(row, 'failed'))
         self.tabs.addTab(self.failed_tab, "Failed")
-
-        # Canceled Tab
-        self.canceled_tab = QWidget()
-        self.canceled_layout = QVBoxLayout(self.canceled_tab)
-        self.canceled_table = QTableWidget(0, 4)
-        self.canceled_table.setHorizontalHeaderLabels(["File Name", "Status", "Size", "Retry"])
-        self.canceled_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.canceled_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.canceled_layout.addWidget(self.canceled_table)
+        self.canceled_tab, self.canceled_table, self.canceled_model = self._history_tab(
+            [("File Name", 'file_name'), ("Status", 'status'), ("Size", 'size'), ("Retry", None)], QStyle.SP_BrowserReload,
+            lambda row: self.retry_download.emit(row, 'canceled'))
         self.tabs.addTab(self.canceled_tab, "Canceled")
+        # Hidden history tabs are only filled when they are switched to
+        self.tabs.currentChanged.connect(self._refresh_history)
+
+        self._rows[self.active_table] = []
 
         # Connect global buttons
         self.pause_all_btn.clicked.connect(self.pause_all)
         self.resume_all_btn.clicked.connect(self.resume_all)
         self.cancel_all_btn.clicked.connect(self.cancel_all)
 
+    def _history_tab(self, columns, button_icon, on_button_clicked):
+        """Build a history tab; returns the tab, its view and its model."""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        model = DownloadsModel(columns, self)
+        view = QTableView()
+        view.setModel(model)
+        view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        view.setEditTriggers(QTableView.NoEditTriggers)
+        delegate = ButtonDelegate(button_icon, view)
+        delegate.clicked.connect(on_button_clicked)
+        view.setItemDelegateForColumn(len(columns) - 1, delegate)
+        layout.addWidget(view)
+        return tab, view, model
+
+    def _open_completed(self, row):
+        self.open_in_explorer.emit(self.completed_model.row(row).file_path)
+
     def check_disk_space(self, file_path, file_size):
-        try:
-            drive = os.path.splitdrive(file_path)[0] or file_path
-            total, used, free = shutil.disk_usage(drive)
-            return free >= file_size, free
-        except Exception:
+        drive = os.path.splitdrive(file_path)[0] or os.path.dirname(file_path) or file_path
+        now = time.monotonic()
+        cached = self._disk_cache.get(drive)
+        if cached and now - cached[0] < self.DISK_CACHE_TTL:
+            free = cached[1]
+        else:
+            try:
+                free = shutil.disk_usage(drive).free
+            except Exception:
+                free = None
+            self._disk_cache[drive] = (now, free)
+        if free is None:
             return True, None  # If check fails, allow download
+        return free >= file_size, free
 
     def update_downloads(self, active, completed, failed, canceled):
+        # The download manager reports every change, so refresh only then, coalescing bursts
         self._active_data = (active, completed, failed, canceled)
-        if active and not self._timer.isActive():
-            self._timer.start()
-        elif not active and self._timer.isActive():
-            self._timer.stop()
-        if not self._timer.isActive():
-            self._refresh_ui()
+        if not self._dirty:
+            self._dirty = True
+            QTimer.singleShot(self.REFRESH_DELAY_MS, self._flush)
+
+    def _flush(self):
+        self._dirty = False
+        self._refresh_ui()
+
+    def _set_text(self, table, row, col, text):
+        """Set a cell's text, reusing its item when there is one."""
+        item = table.item(row, col)
+        if item is None:
+            table.setItem(row, col, QTableWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
+
+    def _sync_rows(self, table, count):
+        """Resize a table and its row cache; returns the cache of what each row currently shows."""
+        if table.rowCount() != count:
+            table.setRowCount(count)
+        rows = self._rows[table]
+        del rows[count:]
+        return rows
+
+    def _action_buttons(self, row):
+        """Build the Pause/Resume/Cancel cell for an active row; returns the widget and its buttons."""
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(0, 0, 0, 0)
+        buttons = (self._mapped_button("Pause", QStyle.SP_MediaPause, self._pause_mapper, row),
+                   self._mapped_button("Resume", QStyle.SP_MediaPlay, self._resume_mapper, row),
+                   self._mapped_button("Cancel", QStyle.SP_MediaStop, self._cancel_mapper, row))
+        for button in buttons:
+            actions_layout.addWidget(button)
+        actions_layout.addStretch()
+        return actions_widget, buttons
 
     def _refresh_ui(self):
-        active, completed, failed, canceled = self._active_data
-        # Active
-        self.active_table.setRowCount(len(active))
-        now = time.time()
+        # The main window sends fresh row lists, so equal data means the tables already show it
+        if self._active_data == self._shown_data:
+            return
+        self._shown_data = self._active_data
+        # Hold back repaints, item signals and column stretching until every table is updated,
+        # so Qt lays out and paints once per refresh instead of once per changed cell
+        tables = (self.active_table, self.completed_table, self.failed_table, self.canceled_table)
+        for table in tables:
+            table.setUpdatesEnabled(False)
+            table.blockSignals(True)
+            table.horizontalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        try:
+            self._refresh_tables()
+        finally:
+            for table in tables:
+                table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+                table.blockSignals(False)
+                table.setUpdatesEnabled(True)
+
+    def _refresh_tables(self):
+        # Rows are diffed against what they last showed, so a tick only touches cells that changed
+        # and existing progress bars and buttons are reused
+        active = self._active_data[0]
+        table = self.active_table
+        rows = self._sync_rows(table, len(active))
+        del self._action_buttons_by_row[len(active):]
         for row, d in enumerate(active):
-            self.active_table.setItem(row, 0, QTableWidgetItem(d['file_name']))
-            self.active_table.setItem(row, 1, QTableWidgetItem(d['status']))
-            progress_widget = QProgressBar()
-            progress_widget.setValue(d['progress'])
-            progress_widget.setTextVisible(True)
-            self.active_table.setCellWidget(row, 2, progress_widget)
-            self.active_table.setItem(row, 3, QTableWidgetItem(d['size']))
-            # ETA calculation
-            eta_str = self._last_eta.get(d['file_path'], "-")
-            if d['status'] == 'Downloading' and d['progress'] > 0 and d['progress'] < 100:
-                key = d['file_path']
-                total_bytes = parse_size(d['size'])
-                bytes_now = d['progress'] * total_bytes // 100 if total_bytes else 0
-                if key in self.last_progress_times:
-                    elapsed = now - self.last_progress_times[key]
-                    bytes_delta = bytes_now - self.last_progress_bytes.get(key, 0)
-                    speed = bytes_delta / elapsed if elapsed > 0 else 0
-                    if speed > 0:
-                        remaining = 100 - d['progress']
-                        bytes_left = total_bytes * remaining // 100
-                        eta = int(bytes_left / speed)
-                        mins, secs = divmod(eta, 60)
-                        eta_str = f"{mins}m {secs}s" if mins else f"{secs}s"
-                        self._last_eta[key] = eta_str
-                self.last_progress_times[key] = now
-                self.last_progress_bytes[key] = bytes_now
-            self.active_table.setItem(row, 4, QTableWidgetItem(eta_str))
+            # The download manager works out the ETA from the worker's transfer speed; the last one
+            # stays on screen while a download is paused or between speed samples
+            eta_str = self._last_eta.get(d.file_path, "-")
+            eta = d.eta_seconds
+            if d.status == 'Downloading' and eta is not None:
+                mins, secs = divmod(eta, 60)
+                eta_str = self._last_eta[d.file_path] = f"{mins}m {secs}s" if mins else f"{secs}s"
             # Disk space check (only warn once per file)
-            if d['status'] == 'Queued' and d['size'] != '-' and not hasattr(self, f'_warned_{d["file_path"]}'):
-                file_size = parse_size(d['size'])
-                enough, free = self.check_disk_space(d['file_path'], file_size)
+            if d.status == 'Queued' and d.size != '-' and d.file_path not in self._warned:
+                file_size = parse_size(d.size)
+                enough, free = self.check_disk_space(d.file_path, file_size)
                 if not enough:
-                    QMessageBox.warning(self, "Low Disk Space", f"Not enough disk space for {d['file_name']}!\nRequired: {d['size']}\nFree: {free // (1024*1024)} MB")
-                    setattr(self, f'_warned_{d["file_path"]}', True)
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(0, 0, 0, 0)
-            if d['can_pause']:
-                pause_btn = QPushButton("Pause")
-                pause_btn.clicked.connect(lambda _, r=row: self.pause_download.emit(r))
-                actions_layout.addWidget(pause_btn)
-            if d['can_resume']:
-                resume_btn = QPushButton("Resume")
-                resume_btn.clicked.connect(lambda _, r=row: self.resume_download.emit(r))
-                actions_layout.addWidget(resume_btn)
-            if d['can_cancel']:
-                cancel_btn = QPushButton("Cancel")
-                cancel_btn.clicked.connect(lambda _, r=row: self.cancel_download.emit(r))
-                actions_layout.addWidget(cancel_btn)
-            actions_layout.addStretch()
-            self.active_table.setCellWidget(row, 5, actions_widget)
-
-        # Completed
-        self.completed_table.setRowCount(len(completed))
-        for row, d in enumerate(completed):
-            self.completed_table.setItem(row, 0, QTableWidgetItem(d['file_name']))
-            self.completed_table.setItem(row, 1, QTableWidgetItem(d['size']))
-            open_btn = QPushButton("Open")
-            open_btn.clicked.connect(lambda _, path=d['file_path']: self.open_in_explorer.emit(path))
-            self.completed_table.setCellWidget(row, 2, open_btn)
-
-        # Failed
-        self.failed_table.setRowCount(len(failed))
-        for row, d in enumerate(failed):
-            self.failed_table.setItem(row, 0, QTableWidgetItem(d['file_name']))
-            self.failed_table.setItem(row, 1, QTableWidgetItem(d['status']))
-            self.failed_table.setItem(row, 2, QTableWidgetItem(d['size']))
-            retry_btn = QPushButton("Retry")
-            retry_btn.clicked.connect(lambda _, r=row: self.retry_download.emit(r, 'failed'))
-            self.failed_table.setCellWidget(row, 3, retry_btn)
-
-        # Canceled
-        self.canceled_table.setRowCount(len(canceled))
-        for row, d in enumerate(canceled):
-            self.canceled_table.setItem(row, 0, QTableWidgetItem(d['file_name']))
-            self.canceled_table.setItem(row, 1, QTableWidgetItem(d['status']))
-            self.canceled_table.setItem(row, 2, QTableWidgetItem(d['size']))
-            retry_btn = QPushButton("Retry")
-            retry_btn.clicked.connect(lambda _, r=row: self.retry_download.emit(r, 'canceled'))
-            self.canceled_table.setCellWidget(row, 3, retry_btn) 
\ No newline at end of file
+                    QMessageBox.warning(self, "Low Disk Space", f"Not enough disk space for {d.file_name}!\nRequired: {d.size}\nFree: {free // (1024*1024)} MB")
+                    self._warned.add(d.file_path)
+            actions = (d.can_pause, d.can_resume, d.can_cancel)
+            shown = (d.file_name, d.status, d.progress, d.size, eta_str, actions)
+            prev = rows[row] if row < len(rows) else None
+            if shown == prev:
+                continue
+            self._set_text(table, row, 0, d.file_name)
+            self._set_text(table, row, 1, d.status)
+            progress_widget = table.cellWidget(row, 2)
+            if progress_widget is None:
+                progress_widget = QProgressBar()
+                progress_widget.setTextVisible(True)
+                table.setCellWidget(row, 2, progress_widget)
+            progress_widget.setValue(d.progress)
+            self._set_text(table, row, 3, d.size)
+            self._set_text(table, row, 4, eta_str)
+            if prev is None:
+                actions_widget, buttons = self._action_buttons(row)
+                table.setCellWidget(row, 5, actions_widget)
+                self._action_buttons_by_row.append(buttons)
+            if prev is None or prev[5] != actions:
+                for button, enabled in zip(self._action_buttons_by_row[row], actions):
+                    button.setVisible(enabled)
+            if prev is None:
+                rows.append(shown)
+            else:
+                rows[row] = shown
+        # Forget ETA state for downloads that are no longer active
+        live_keys = {d.file_path for d in active}
+        for key in self._last_eta.keys() - live_keys:
+            del self._last_eta[key]
+
+        self._refresh_history()
+
+    def _refresh_history(self):
+        """Push the latest rows into the history tab being shown, if any."""
+        _, completed, failed, canceled = self._active_data
+        current = self.tabs.currentWidget()
+        if current is self.completed_tab:
+            self.completed_model.set_rows(completed)
+        elif current is self.failed_tab:
+            self.failed_model.set_rows(failed)
+        elif current is self.canceled_tab:
+            self.canceled_model.set_rows(canceled)
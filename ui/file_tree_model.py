@@ -0,0 +1,214 @@
+# ui/file_tree_model.py
+# Lightweight tree model for directory listings shown in the downloader tab.
+
+import os
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+
+HEADERS = ("Name", "Size", "Type", "Modified")
+# data() role returning every role the delegate paints from, as one {role: value} dict
+MultipleRoles = Qt.UserRole + 100
+
+def _norm_path(path):
+    # Remove trailing slashes except for root
+    if path == '/':
+        return '/'
+    return path.rstrip('/')
+
+class _Node:
+    """One listed file or directory; the model keeps these instead of item widgets."""
+    __slots__ = ('columns', 'url', 'is_dir', 'checked', 'parent', 'row', 'children')
+
+    def __init__(self, columns=(), url=None, is_dir=False, parent=None):
+        self.columns = columns  # Display text for each column
+        self.url = url  # Full URL for downloads (HTTP) or path (FTP)
+        self.is_dir = is_dir
+        self.checked = False
+        self.parent = parent
+        self.row = 0
+        self.children = []
+
+class FileTreeModel(QAbstractItemModel):
+    """Checkable tree of listed items; checking a directory checks everything below it."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = _Node()
+        self._dirs = {}  # normalized directory path -> node
+        self._checked = {}  # id(node) -> node for every checked file, kept as checks change
+
+    def clear(self):
+        self.beginResetModel()
+        self._root = _Node()
+        self._dirs = {}
+        self._checked = {}
+        self.endResetModel()
+
+    def add_items(self, items):
+        """Append a batch of lister item dicts, signalling one insertion per existing parent."""
+        if not items:
+            return
+        if not self._dirs:
+            # The directory the listing started from maps to the root
+            first = items[0]
+            self._dirs[first.get('parent', os.path.dirname(_norm_path(first['path'])))] = self._root
+        new_nodes = set()  # ids of nodes created in this batch
+        groups = {}  # id(parent already in the model) -> (parent, [new children])
+        for item_data in items:
+            # The lister works out each item's parent directory on its own thread; listings cached
+            # before it did are normalized here
+            parent_path = item_data.get('parent')
+            if parent_path is None:
+                parent_path = os.path.dirname(_norm_path(item_data['path']))
+            parent = self._dirs.get(parent_path, self._root)
+            node = _Node((item_data['name'], str(item_data['size']), item_data['type'], item_data['modified']),
+                         item_data.get('full_url', item_data['path']), item_data['type'] == 'Directory', parent)
+            new_nodes.add(id(node))
+            if node.is_dir:
+                self._dirs[_norm_path(item_data['path'])] = node
+            if id(parent) in new_nodes:
+                # The parent is inserted with this batch too, so its subtree needs no signal of its own
+                node.row = len(parent.children)
+                parent.children.append(node)
+            else:
+                groups.setdefault(id(parent), (parent, []))[1].append(node)
+        for parent, children in groups.values():
+            first = len(parent.children)
+            self.beginInsertRows(self._index_of(parent), first, first + len(children) - 1)
+            for row, node in enumerate(children, first):
+                node.row = row
+            parent.children.extend(children)
+            self.endInsertRows()
+
+    def checked_urls(self):
+        """URLs of the checked files, in the order they were checked."""
+        return [node.url for node in self._checked.values()]
+
+    def _mark(self, node, checked):
+        node.checked = checked
+        if not node.is_dir:
+            if checked:
+                self._checked[id(node)] = node
+            else:
+                self._checked.pop(id(node), None)
+
+    def _index_of(self, node):
+        return QModelIndex() if node is self._root else self.createIndex(node.row, 0, node)
+
+    def _set_checked(self, node, checked):
+        """Check or uncheck every node below node, signalling one change per sibling range that changed."""
+        stack = [node]
+        while stack:
+            parent = stack.pop()
+            children = parent.children
+            changed = [child.row for child in children if child.checked != checked]
+            if changed:
+                for row in changed:
+                    self._mark(children[row], checked)
+                first, last = changed[0], changed[-1]
+                self.dataChanged.emit(self.createIndex(first, 0, children[first]),
+                                      self.createIndex(last, 0, children[last]), [Qt.CheckStateRole])
+            # Directories are walked even when already in the target state; a file below may differ
+            stack.extend(child for child in children if child.is_dir)
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = parent.internalPointer() if parent.isValid() else self._root
+        if 0 <= row < len(node.children) and 0 <= column < len(HEADERS):
+            return self.createIndex(row, column, node.children[row])
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = parent.internalPointer() if parent.isValid() else self._root
+        return len(node.children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(HEADERS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        return self.rowCount(parent) > 0
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return node.columns[index.column()]
+        if role == MultipleRoles:
+            roles = {Qt.DisplayRole: node.columns[index.column()]}
+            if index.column() == 0:
+                roles[Qt.CheckStateRole] = Qt.Checked if node.checked else Qt.Unchecked
+            return roles
+        if index.column() == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if node.checked else Qt.Unchecked
+            if role == Qt.UserRole:
+                return node.url
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or index.column() != 0:
+            return False
+        node = index.internalPointer()
+        checked = value == Qt.Checked
+        if node.checked != checked:
+            self._mark(node, checked)
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self._set_checked(node, checked)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+class SpeedUpDelegate(QStyledItemDelegate):
+    """Paints FileTreeModel cells from one cached MultipleRoles lookup instead of a data() call per role."""
+
+    def __init__(self, parent=None, maxsize=1024):
+        super().__init__(parent)
+        self._cache = OrderedDict()  # (node id, column) -> roles, least recently painted first
+        self._maxsize = maxsize
+
+    def set_model(self, model):
+        """Watch model so cached roles are dropped whenever its data changes."""
+        for signal in (model.dataChanged, model.modelReset, model.layoutChanged):
+            signal.connect(self.clear_cache)
+
+    def clear_cache(self, *args):
+        self._cache.clear()
+
+    def _roles(self, index):
+        key = (index.internalId(), index.column())
+        roles = self._cache.get(key)
+        if roles is None:
+            roles = self._cache[key] = index.data(MultipleRoles)
+            if len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return roles
+
+    def initStyleOption(self, option, index):
+        roles = self._roles(index)
+        option.text = roles[Qt.DisplayRole]
+        option.features |= QStyleOptionViewItem.HasDisplay
+        check_state = roles.get(Qt.CheckStateRole)
+        if check_state is not None:
+            option.checkState = check_state
+            option.features |= QStyleOptionViewItem.HasCheckIndicator
@@ -0,0 +1,13 @@
+# ui/icons.py
+# Standard style icons shared by every widget that shows them.
+
+from PyQt5.QtWidgets import QApplication
+
+_icons = {}
+
+def standard_icon(standard_pixmap):
+    """A QStyle standard icon, resolved once per process instead of once per widget."""
+    icon = _icons.get(standard_pixmap)
+    if icon is None:
+        icon = _icons[standard_pixmap] = QApplication.style().standardIcon(standard_pixmap)
+    return icon
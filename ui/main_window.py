@@ -2,41 +2,77 @@
 # This file defines the main window of the application using PyQt5.
 
 import os
+import sys
 import logging
-from functools import partial
+from functools import partial, lru_cache
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, 
-    QTreeWidget, QTreeWidgetItem, QProgressBar, QLabel, QFileDialog, QMessageBox, 
+    QTreeView, QProgressBar, QLabel, QFileDialog, QMessageBox, 
     QSplitter, QFrame, QAction, QToolBar, QStatusBar, QSpinBox, QDialog, 
-    QTextEdit, QApplication, QStyle, QTreeWidgetItemIterator, QSizePolicy, QTabWidget
+    QPlainTextEdit, QApplication, QStyle, QSizePolicy, QTabWidget
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QIcon, QMovie, QPalette, QColor
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QUrl
+from PyQt5.QtGui import QIcon, QMovie, QPalette, QColor, QDesktopServices
 
 from core.lister import DirectoryLister
 from core.downloader import DownloadManager
+from core.url_utils import canonicalize_url
 from config.manager import ConfigManager
 from utils.logger import setup_logger
-from ui.downloads_tab import DownloadsTab
+from ui.downloads_tab import DownloadsTab, DownloadRow
 from ui.settings_tab import SettingsTab
 from ui.browser_tab import BrowserTab
-import sys
-import subprocess
+from ui.file_tree_model import FileTreeModel, SpeedUpDelegate
+from ui.icons import standard_icon
 from urllib.parse import unquote
 
 logger = setup_logger()
 
+SPINNER_IMAGE = ":/qt-project.org/styles/commonstyle/images/standardbutton-apply-32.png"
+# Theme stylesheets, one <theme name>.qss per theme offered in the settings tab
+THEMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources', 'themes')
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 def format_bytes(size):
     """Formats bytes into KB, MB, GB, etc."""
-    if size <= 0: return "0 B"
-    power, n, labels = 1024, 0, {0: '', 1: 'K', 2: 'M', 3: 'G', 4: 'T'}
-    while size >= power and n < len(labels) -1:
-        size /= power
-        n += 1
-    return f"{size:.2f} {labels[n]}B"
+    if not size or size <= 0: return "0 B"
+    return _format_bytes(int(size))
+
+@lru_cache(maxsize=256)
+def _format_bytes(size):
+    # Each unit is 2**10 times the previous one, so the unit index comes straight from the bit length
+    n = min((size.bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{size / (1 << (10 * n)):.2f} {_BYTE_UNITS[n]}"
+
+# Built on first use rather than at import, since a QPalette needs the QApplication to exist
+@lru_cache(maxsize=1)
+def _dark_palette():
+    """The dark palette applied to message boxes, shared by every dialog."""
+    palette = QPalette()
+    palette.setColor(QPalette.Window, QColor('#23272b'))
+    palette.setColor(QPalette.Base, QColor('#23272b'))
+    palette.setColor(QPalette.Text, QColor('#8B0000'))
+    palette.setColor(QPalette.WindowText, QColor('#8B0000'))
+    palette.setColor(QPalette.Button, QColor('#37474f'))
+    palette.setColor(QPalette.ButtonText, QColor('#8B0000'))
+    palette.setColor(QPalette.Light, QColor('#263238'))
+    palette.setColor(QPalette.Midlight, QColor('#263238'))
+    palette.setColor(QPalette.Dark, QColor('#181c1f'))
+    palette.setColor(QPalette.Mid, QColor('#263238'))
+    palette.setColor(QPalette.AlternateBase, QColor('#21252b'))
+    return palette
 
 class MainWindow(QMainWindow):
     """The main window for the FTP Batch Downloader application."""
+    _qss_cache = {}  # theme name -> stylesheet text
+    _applied_qss = None  # The cached stylesheet the application currently uses
+    UI_FLUSH_MS = 33  # Progress signals are applied to widgets at most ~30 times a second
+    CONFIG_DEBOUNCE_MS = 300  # Quiet time after the last settings spinbox change before it is stored
+    LOG_READ_CHUNK = 64 * 1024  # Characters of the log file read and appended per step
+    LOG_VIEW_MAX_LINES = 50000  # The log viewer keeps only the newest lines
+    LOG_SINGLE_READ_MAX = 1 << 20  # Log files smaller than this are read in one go
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("FTP Batch Downloader")
@@ -54,7 +90,15 @@ class MainWindow(QMainWindow):
         self.init_ui()
         self.create_toolbars()
         self.create_status_bar()
-        self.lister_thread, self.path_to_item_map, self.file_progress_widgets = None, {}, {}
+        self.lister = None
+        self.listed_sizes = {}  # download URL -> size in bytes, when the listing showed one
+        self._row_cache = {}  # (url, rel_path) -> (record fields the row was built from, DownloadRow)
+        # Latest progress values waiting for the next flush; only the newest of each is shown
+        self._pending_status = None  # status bar text
+        self._pending_overall = None  # (downloaded, total)
+        self._ui_flush_timer = QTimer(self)
+        self._ui_flush_timer.setInterval(self.UI_FLUSH_MS)
+        self._ui_flush_timer.timeout.connect(self._flush_ui)
         self.is_downloading = False
         self.connect_signals()
         # Connect download manager to downloads tab
@@ -62,9 +106,9 @@ class MainWindow(QMainWindow):
         self.downloads_tab.pause_all.connect(self.download_manager.pause_all)
         self.downloads_tab.resume_all.connect(self.download_manager.resume_all)
         self.downloads_tab.cancel_all.connect(self.download_manager.cancel_all)
-        self.downloads_tab.pause_download.connect(lambda row: self._downloads_tab_action(row, 'pause'))
-        self.downloads_tab.resume_download.connect(lambda row: self._downloads_tab_action(row, 'resume'))
-        self.downloads_tab.cancel_download.connect(lambda row: self._downloads_tab_action(row, 'cancel'))
+        self.downloads_tab.pause_download.connect(self._pause_row)
+        self.downloads_tab.resume_download.connect(self._resume_row)
+        self.downloads_tab.cancel_download.connect(self._cancel_row)
         self.downloads_tab.retry_download.connect(self._downloads_tab_retry)
         self.downloads_tab.open_in_explorer.connect(self.open_in_explorer)
 
@@ -88,8 +132,14 @@ class MainWindow(QMainWindow):
             depth=self.config_manager.get("listing_depth"),
             theme_name=theme_name
         )
-        self.settings_tab.concurrent_changed.connect(lambda val: self.config_manager.set("max_concurrent_downloads", val))
-        self.settings_tab.depth_changed.connect(lambda val: self.config_manager.set("listing_depth", val))
+        # Spinbox changes are coalesced so scrubbing through values stores only the last one
+        self._pending_cfg = {}
+        self._cfg_timer = QTimer(self)
+        self._cfg_timer.setSingleShot(True)
+        self._cfg_timer.setInterval(self.CONFIG_DEBOUNCE_MS)
+        self._cfg_timer.timeout.connect(self._apply_pending_cfg)
+        self.settings_tab.concurrent_changed.connect(partial(self._debounced_set, "max_concurrent_downloads"))
+        self.settings_tab.depth_changed.connect(partial(self._debounced_set, "listing_depth"))
         self.settings_tab.view_log.connect(self.show_error_log)
         self.settings_tab.theme_changed.connect(self.apply_theme)
         self.tab_widget.addTab(self.settings_tab, "Settings")
@@ -106,16 +156,20 @@ class MainWindow(QMainWindow):
         self.url_input = QLineEdit(); self.url_input.setPlaceholderText("Drag & Drop or Paste FTP/HTTP URL...")
         self.url_input.setClearButtonEnabled(True)
         self.url_input.setMinimumHeight(32)
-        self.fetch_button = QPushButton("Fetch"); self.fetch_button.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
+        self.fetch_button = QPushButton("Fetch"); self.fetch_button.setIcon(standard_icon(QStyle.SP_BrowserReload))
         self.fetch_button.setMinimumHeight(32)
         self.cancel_fetch_button = QPushButton("Cancel Fetch"); self.cancel_fetch_button.setEnabled(False)
         self.cancel_fetch_button.setMinimumHeight(32)
         url_layout.addWidget(self.url_input); url_layout.addWidget(self.fetch_button); url_layout.addWidget(self.cancel_fetch_button); main_layout.addLayout(url_layout)
         splitter = QSplitter(Qt.Vertical); main_layout.addWidget(splitter)
-        self.tree_widget = QTreeWidget(); self.tree_widget.setHeaderLabels(["Name", "Size", "Type", "Modified"])
+        # Listings can run to many thousands of rows, so they live in a model and only visible rows are painted
+        self.tree_model = FileTreeModel(self)
+        self.tree_widget = QTreeView(); self.tree_widget.setModel(self.tree_model); self.tree_widget.setUniformRowHeights(True)
+        self.tree_delegate = SpeedUpDelegate(self.tree_widget); self.tree_delegate.set_model(self.tree_model)
+        self.tree_widget.setItemDelegate(self.tree_delegate)
         self.tree_widget.setColumnWidth(0, 500); self.tree_widget.setColumnWidth(1, 120); self.tree_widget.setColumnWidth(2, 120)
         self.tree_widget.setAlternatingRowColors(True)
-        self.tree_widget.setStyleSheet("QTreeWidget { font-size: 14px; } QTreeWidget::item:selected { background: #e0f7fa; }")
+        self.tree_widget.setStyleSheet("QTreeView { font-size: 14px; } QTreeView::item:selected { background: #e0f7fa; }")
         splitter.addWidget(self.tree_widget)
         # Remove progress_frame and per-file progress bars
         # Remove overall_progress and per_file_progress_layout
@@ -124,7 +178,7 @@ class MainWindow(QMainWindow):
         self.download_path_input.setMinimumHeight(32)
         self.browse_button = QPushButton("Browse..."); self.browse_button.setMinimumHeight(32)
         self.download_button = QPushButton("Download")
-        self.download_button.setIcon(self.style().standardIcon(QStyle.SP_ArrowDown))
+        self.download_button.setIcon(standard_icon(QStyle.SP_ArrowDown))
         self.download_button.setMinimumHeight(32)
         self.download_button.setStyleSheet("QPushButton { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #00bcd4, stop:1 #8bc34a); color: white; border-radius: 8px; font-weight: bold; } QPushButton:hover { background: #26c6da; }")
         download_controls_layout.addWidget(QLabel("Download To:")); download_controls_layout.addWidget(self.download_path_input)
@@ -132,134 +186,32 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(download_controls_layout)
         self.spinner_label = QLabel()
         self.spinner_label.setFixedSize(32, 32)
-        self.spinner_movie = QMovie(":/qt-project.org/styles/commonstyle/images/standardbutton-apply-32.png")
-        self.spinner_label.setMovie(self.spinner_movie)
+        self.spinner_movie = None  # Loaded the first time a download starts
         self.spinner_label.setVisible(False)
         main_layout.addWidget(self.spinner_label, alignment=Qt.AlignRight)
-        self.setStyleSheet('''
-            QMainWindow { background: #232946; }
-            QPushButton {
-                border-radius: 8px;
-                padding: 6px 16px;
-                font-size: 14px;
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #2196F3, stop:1 #FF9800);
-                color: #fff;
-                font-weight: bold;
-            }
-            QPushButton:pressed {
-                background: #FF9800;
-                color: #fff;
-            }
-            QPushButton:hover {
-                background: #4CAF50;
-                color: #fff;
-            }
-            QLineEdit {
-                border: 1.5px solid #2196F3;
-                border-radius: 8px;
-                padding: 4px 8px;
-                font-size: 14px;
-                background: #393E6B;
-                color: #fff;
-                selection-background-color: #FF9800;
-                selection-color: #232946;
-            }
-            QLabel {
-                font-size: 14px;
-                color: #E0E0E0;
-            }
-            QToolBar {
-                background: #232946;
-                border-bottom: 2px solid #2196F3;
-            }
-            QStatusBar {
-                background: #232946;
-                border-top: 2px solid #2196F3;
-                color: #fff;
-            }
-            QTreeWidget {
-                font-size: 14px;
-                background: #393E6B;
-                color: #fff;
-                alternate-background-color: #232946;
-            }
-            QTreeWidget::item:selected {
-                background: #2196F3;
-                color: #fff;
-            }
-            QTreeWidget::item:hover {
-                background: #FF9800;
-                color: #fff;
-            }
-            QHeaderView::section {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #2196F3, stop:1 #FF9800);
-                color: #fff;
-                border: none;
-                font-weight: bold;
-            }
-            QProgressBar {
-                border-radius: 8px;
-                background: #232946;
-                color: #fff;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #4CAF50, stop:1 #2196F3);
-                border-radius: 8px;
-            }
-            QTabWidget::pane {
-                border: 2px solid #2196F3;
-                background: #232946;
-            }
-            QTabBar::tab {
-                background: #393E6B;
-                color: #fff;
-                padding: 6px 16px;
-                min-width: 80px;
-                min-height: 28px;
-                font-size: 13px;
-                border-top-left-radius: 6px;
-                border-top-right-radius: 6px;
-                font-weight: bold;
-                margin-right: 4px;
-            }
-            QTabWidget::tab-bar {
-                alignment: center;
-            }
-            QTabBar::tab:selected {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #2196F3, stop:1 #FF9800);
-                color: #fff;
-            }
-            QTabBar::tab:hover {
-                background: #FF9800;
-                color: #fff;
-            }
-        ''')
 
     def connect_signals(self):
         self.browse_button.clicked.connect(self.browse_download_path)
         self.download_button.clicked.connect(self.start_download)
         self.fetch_button.clicked.connect(self.fetch_directory_listing)
         self.cancel_fetch_button.clicked.connect(self.cancel_fetch)
-        self.tree_widget.itemChanged.connect(self.handle_item_check)
         self.download_manager.file_started.connect(self.on_file_download_started)
-        self.download_manager.file_progress.connect(self.on_file_progress)
         self.download_manager.file_finished.connect(self.on_file_download_finished)
-        self.download_manager.file_status_changed.connect(self.on_file_status_changed)
         self.download_manager.overall_progress.connect(self.on_overall_progress)
         self.download_manager.all_finished.connect(self.on_all_downloads_finished)
         
         # Connect browser tab signals
         self.browser_tab.url_selected.connect(self.handle_browser_url_selected)
+        self.browser_tab.status_message.connect(self.statusBar.showMessage)
         self.download_manager.error.connect(self.on_download_error)
         self.download_manager.size_calc_progress.connect(self.on_size_calc_progress)
         self.download_manager.size_calc_finished.connect(self.on_size_calc_finished)
 
     def create_actions(self):
-        self.pause_all_action = QAction(self.style().standardIcon(QStyle.SP_MediaPause), "Pause All", self)
-        self.resume_all_action = QAction(self.style().standardIcon(QStyle.SP_MediaPlay), "Resume All", self)
-        self.cancel_action = QAction(self.style().standardIcon(QStyle.SP_MediaStop), "Cancel All", self)
-        self.view_log_action = QAction(self.style().standardIcon(QStyle.SP_FileIcon), "View Log", self)
+        self.pause_all_action = QAction(standard_icon(QStyle.SP_MediaPause), "Pause All", self)
+        self.resume_all_action = QAction(standard_icon(QStyle.SP_MediaPlay), "Resume All", self)
+        self.cancel_action = QAction(standard_icon(QStyle.SP_MediaStop), "Cancel All", self)
+        self.view_log_action = QAction(standard_icon(QStyle.SP_FileIcon), "View Log", self)
         self.pause_all_action.triggered.connect(self.download_manager.pause_all)
         self.resume_all_action.triggered.connect(self.download_manager.resume_all)
         self.cancel_action.triggered.connect(self.cancel_downloads)
@@ -281,12 +233,17 @@ class MainWindow(QMainWindow):
         # Do NOT disable download_button, url_input, or browse_button during downloads
         # Only disable fetch/cancel fetch buttons as needed (handled elsewhere)
         if downloading:
+            if self.spinner_movie is None:
+                self.spinner_movie = QMovie(SPINNER_IMAGE)
+                self.spinner_movie.setCacheMode(QMovie.CacheAll)  # Decode each frame once
+                self.spinner_label.setMovie(self.spinner_movie)
             self.spinner_label.setVisible(True)
             self.spinner_movie.start()
         else:
             self.spinner_label.setVisible(False)
-            self.spinner_movie.stop()
-        if message: self.statusBar.showMessage(message)
+            if self.spinner_movie is not None:
+                self.spinner_movie.stop()
+        if message: self._discard_pending_status(); self.statusBar.showMessage(message)
 
     def start_download(self):
         # Allow queuing new downloads even if already downloading
@@ -300,19 +257,41 @@ class MainWindow(QMainWindow):
         base_folder = os.path.join(download_path, root_dir_name)
         os.makedirs(base_folder, exist_ok=True)
         self.set_ui_state(True, "Calculating total download size...")
-        # Do NOT clear previous progress widgets or layout here
-        # Only add new widgets for new files in on_file_download_started
         # Pass (url, rel_path) and base_folder to the download manager
-        self.download_manager.start_downloads(selected_files, base_folder)
+        self.download_manager.start_downloads(selected_files, base_folder, self.listed_sizes)
 
-    def on_size_calc_progress(self, processed, total): self.statusBar.showMessage(f"Calculating size... ({processed}/{total} files)")
-    def on_size_calc_finished(self): self.statusBar.showMessage("Starting downloads...")
+    def on_size_calc_progress(self, processed, total):
+        self._pending_status, self._pending_overall = f"Calculating size... ({processed}/{total} files)", None
+        self._schedule_ui_flush()
+
+    def on_size_calc_finished(self):
+        self._discard_pending_status(); self.statusBar.showMessage("Starting downloads...")
 
     def on_overall_progress(self, downloaded_bytes, total_bytes):
-        self.statusBar.showMessage(f"Downloading... {format_bytes(downloaded_bytes)} / {format_bytes(total_bytes)}")
+        self._pending_status, self._pending_overall = None, (downloaded_bytes, total_bytes)
+        self._schedule_ui_flush()
+
+    def _schedule_ui_flush(self):
+        if not self._ui_flush_timer.isActive():
+            self._ui_flush_timer.start()
+
+    def _discard_pending_status(self):
+        """Drop queued progress text so it cannot overwrite a message shown right now."""
+        self._pending_status = self._pending_overall = None
+
+    def _flush_ui(self):
+        """Apply the newest queued progress values; the next queued value starts the timer again."""
+        if self._pending_overall is not None:
+            downloaded_bytes, total_bytes = self._pending_overall
+            self.statusBar.showMessage(f"Downloading... {format_bytes(downloaded_bytes)} / {format_bytes(total_bytes)}")
+        elif self._pending_status is not None:
+            self.statusBar.showMessage(self._pending_status)
+        self._discard_pending_status()
+        self._ui_flush_timer.stop()
 
     def on_all_downloads_finished(self):
         if self.is_downloading:
+            self._discard_pending_status()
             self.statusBar.showMessage("All downloads finished.", 5000)
             # Removed: if self.overall_progress.value() >= self.overall_progress.maximum():
             # Removed: self.show_message("Complete", "All downloads completed successfully.", QMessageBox.Information)
@@ -323,27 +302,11 @@ class MainWindow(QMainWindow):
         # No per-file progress UI in main window anymore
         pass
 
-    def on_file_progress(self, worker_id, downloaded_bytes, total_bytes):
-        if worker_id in self.file_progress_widgets:
-            widgets = self.file_progress_widgets[worker_id]
-            if total_bytes > 0:
-                if widgets['progress'].maximum() != total_bytes: widgets['progress'].setMaximum(total_bytes)
-                widgets['progress'].setValue(downloaded_bytes)
-                widgets['progress'].setFormat(f"%p% ({format_bytes(downloaded_bytes)}/{format_bytes(total_bytes)})")
-            else: widgets['progress'].setFormat(f"{format_bytes(downloaded_bytes)} downloaded")
-
-    def on_file_status_changed(self, worker_id, status):
-        if worker_id in self.file_progress_widgets:
-            widgets = self.file_progress_widgets[worker_id]
-            widgets['label'].setText(f"{os.path.basename(worker_id)}: {status}")
-            widgets['pause'].setEnabled(status in ["Downloading", "Retrying..."])
-            widgets['resume'].setEnabled(status == "Paused")
-            widgets['cancel'].setEnabled(status not in ["Completed", "Canceled", "Error"])
-
     def on_file_download_finished(self, worker_id, filename):
-        self.on_file_status_changed(worker_id, "Completed"); logger.info(f"Finished downloading {filename}")
+        # Per-file status is shown by the downloads tab, which refreshes on downloads_updated
+        logger.info(f"Finished downloading {filename}")
     def on_download_error(self, filename, message): logger.error(f"Error downloading {filename}: {message}")
-    def cancel_downloads(self): self.statusBar.showMessage("Canceling..."); self.download_manager.cancel_all()
+    def cancel_downloads(self): self._discard_pending_status(); self.statusBar.showMessage("Canceling..."); self.download_manager.cancel_all()
 
     def fetch_directory_listing(self):
         # Allow fetching new directory listings even if downloads are in progress
@@ -353,10 +316,8 @@ class MainWindow(QMainWindow):
             return
         
         # Validate URL before proceeding
-        from core.url_utils import ensure_url_encoded, is_valid_ftp_url
-        
-        encoded_url = ensure_url_encoded(url)
-        if not encoded_url or not is_valid_ftp_url(encoded_url):
+        encoded_url = canonicalize_url(url)
+        if not encoded_url:
             self.show_message("Error", f"Invalid FTP/HTTP URL: {url}", QMessageBox.Critical)
             return
         
@@ -365,41 +326,24 @@ class MainWindow(QMainWindow):
             self.url_input.setText(encoded_url)
             url = encoded_url
         
-        self.tree_widget.clear()
-        self.path_to_item_map.clear()
+        self.tree_model.clear()
+        self.listed_sizes.clear()
         self.set_ui_state(False, f"Fetching from {url}...")
         self.fetch_button.setEnabled(False)
         self.cancel_fetch_button.setEnabled(True)
         
-        self.lister_thread = DirectoryLister(url, self.config_manager)
-        self.lister_thread.item_found.connect(self.add_tree_item)
-        self.lister_thread.error.connect(self.on_listing_error)
-        self.lister_thread.finished.connect(self.on_listing_finished)
-        self.lister_thread.cache_status.connect(self.on_cache_status)
-        self.lister_thread.start()
-
-    def add_tree_item(self, item_data):
-        # Normalize paths: remove trailing slashes except for root
-        def norm_path(path):
-            if path == '/':
-                return '/'
-            return path.rstrip('/')
-
-        # On first call, ensure the root directory is mapped to the invisible root
-        if not self.path_to_item_map:
-            root_path = os.path.dirname(norm_path(item_data['path']))
-            self.path_to_item_map[root_path] = self.tree_widget.invisibleRootItem()
-
-        parent_path = os.path.dirname(norm_path(item_data['path']))
-        parent_item = self.path_to_item_map.get(parent_path, self.tree_widget.invisibleRootItem())
-        tree_item = QTreeWidgetItem(parent_item, [item_data['name'], str(item_data['size']), item_data['type'], item_data['modified']])
-        tree_item.setFlags(tree_item.flags() | Qt.ItemIsUserCheckable); tree_item.setCheckState(0, Qt.Unchecked)
-        
-        # Store the full URL for downloads (HTTP) or path (FTP)
-        download_url = item_data.get('full_url', item_data['path'])
-        tree_item.setData(0, Qt.UserRole, download_url)
-        if item_data['type'] == 'Directory':
-            self.path_to_item_map[norm_path(item_data['path'])] = tree_item
+        self.lister = DirectoryLister(url, self.config_manager)
+        self.lister.item_found_batch.connect(self.add_tree_items)
+        self.lister.error.connect(self.on_listing_error)
+        self.lister.finished.connect(self.on_listing_finished)
+        self.lister.cache_status.connect(self.on_cache_status)
+        self.lister.start()
+
+    def add_tree_items(self, items):
+        self.tree_model.add_items(items)
+        for item_data in items:
+            if isinstance(item_data['size'], int):
+                self.listed_sizes[item_data.get('full_url', item_data['path'])] = item_data['size']
     
     def on_listing_finished(self):
         self.statusBar.showMessage("Listing complete.", 5000); self.fetch_button.setEnabled(True); self.cancel_fetch_button.setEnabled(False); self.tree_widget.expandToDepth(0)
@@ -411,35 +355,18 @@ class MainWindow(QMainWindow):
         """Handle cache status updates from directory lister."""
         self.statusBar.showMessage(status, 2000)
 
-    def handle_item_check(self, item, column):
-        if column == 0:
-            self.tree_widget.blockSignals(True)
-            check_state = item.checkState(0)
-            def set_check_state_recursive(parent, check_state):
-                for i in range(parent.childCount()):
-                    child = parent.child(i)
-                    child.setCheckState(0, check_state)
-                    set_check_state_recursive(child, check_state)
-            set_check_state_recursive(item, check_state)
-            self.tree_widget.blockSignals(False)
-
     def get_checked_items(self):
         checked = []
-        iterator = QTreeWidgetItemIterator(self.tree_widget, QTreeWidgetItemIterator.All)
         # Determine the root path (the directory the user fetched)
         root_url = self.url_input.text().strip()
         root_path = root_url if root_url.endswith('/') else root_url + '/'
-        while iterator.value():
-            item = iterator.value()
-            if item.checkState(0) == Qt.Checked and item.text(2) != "Directory":
-                url = item.data(0, Qt.UserRole)
-                # Compute relative path from the root directory
-                if url.startswith(root_path):
-                    rel_path = url[len(root_path):].lstrip('/')
-                else:
-                    rel_path = os.path.basename(url)
-                checked.append((url, rel_path))
-            iterator += 1
+        for url in self.tree_model.checked_urls():
+            # Compute relative path from the root directory
+            if url.startswith(root_path):
+                rel_path = url[len(root_path):].lstrip('/')
+            else:
+                rel_path = os.path.basename(url)
+            checked.append((url, rel_path))
         return checked
 
     def browse_download_path(self):
@@ -448,37 +375,47 @@ class MainWindow(QMainWindow):
 
     def show_error_log(self):
         log_dialog = QDialog(self); log_dialog.setWindowTitle("Error Log"); log_dialog.setGeometry(200, 200, 800, 600)
-        layout = QVBoxLayout(log_dialog); log_view = QTextEdit(); log_view.setReadOnly(True)
-        try:
-            with open('logs/app.log', 'r') as f: log_content = f.read()
-        except Exception as e: log_content = f"Could not read log file: {e}"
-        log_view.setText(log_content); layout.addWidget(log_view)
+        layout = QVBoxLayout(log_dialog); log_view = QPlainTextEdit(); log_view.setReadOnly(True)
+        log_view.setMaximumBlockCount(self.LOG_VIEW_MAX_LINES)
+        try: self._load_log(log_view, 'logs/app.log')
+        except Exception as e: log_view.setPlainText(f"Could not read log file: {e}")
+        layout.addWidget(log_view)
         # Apply colorful palette to dialog and text edit
         log_dialog.setStyleSheet('''
             QDialog { background: #232946; border: 2px solid #2196F3; }
-            QTextEdit { background: #393E6B; color: #fff; font-size: 14px; border: 1.5px solid #2196F3; border-radius: 8px; }
+            QPlainTextEdit { background: #393E6B; color: #fff; font-size: 14px; border: 1.5px solid #2196F3; border-radius: 8px; }
         ''')
         log_dialog.exec_()
 
+    def _load_log(self, log_view, path):
+        """Show a log file in log_view; large files are appended a chunk of whole lines at a time,
+        keeping the UI responsive."""
+        fd = os.open(path, os.O_RDONLY)
+        size = os.fstat(fd).st_size
+        if size < self.LOG_SINGLE_READ_MAX:
+            # One unbuffered read is cheapest for the usual small log
+            try: data = os.read(fd, size)
+            finally: os.close(fd)
+            text = data.decode('utf-8', 'replace').replace('\r\n', '\n')
+            log_view.setPlainText(text[:-1] if text.endswith('\n') else text)
+            return
+        with open(fd, 'r', encoding='utf-8', errors='replace', buffering=self.LOG_READ_CHUNK * 2) as f:
+            partial = ""
+            while True:
+                chunk = f.read(self.LOG_READ_CHUNK)
+                if not chunk: break
+                # appendPlainText starts a new line, so a line cut by the chunk boundary waits for the next chunk
+                lines, newline, partial = (partial + chunk).rpartition('\n')
+                if newline: log_view.appendPlainText(lines)
+                QApplication.processEvents()
+            if partial: log_view.appendPlainText(partial)
+
     def show_message(self, title, message, icon=QMessageBox.Information):
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle(title)
         msg_box.setText(message)
         msg_box.setIcon(icon)
-        # Apply comprehensive dark palette
-        dark_palette = QPalette()
-        dark_palette.setColor(QPalette.Window, QColor('#23272b'))
-        dark_palette.setColor(QPalette.Base, QColor('#23272b'))
-        dark_palette.setColor(QPalette.Text, QColor('#8B0000'))
-        dark_palette.setColor(QPalette.WindowText, QColor('#8B0000'))
-        dark_palette.setColor(QPalette.Button, QColor('#37474f'))
-        dark_palette.setColor(QPalette.ButtonText, QColor('#8B0000'))
-        dark_palette.setColor(QPalette.Light, QColor('#263238'))
-        dark_palette.setColor(QPalette.Midlight, QColor('#263238'))
-        dark_palette.setColor(QPalette.Dark, QColor('#181c1f'))
-        dark_palette.setColor(QPalette.Mid, QColor('#263238'))
-        dark_palette.setColor(QPalette.AlternateBase, QColor('#21252b'))
-        msg_box.setPalette(dark_palette)
+        msg_box.setPalette(_dark_palette())
         msg_box.exec_()
 
     def dragEnterEvent(self, event):
@@ -494,48 +431,44 @@ class MainWindow(QMainWindow):
             msg_box.setIcon(QMessageBox.Question)
             msg_box.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
             msg_box.setDefaultButton(QMessageBox.No)
-            # Apply dark palette
-            dark_palette = QPalette()
-            dark_palette.setColor(QPalette.Window, QColor('#23272b'))
-            dark_palette.setColor(QPalette.Base, QColor('#23272b'))
-            dark_palette.setColor(QPalette.Text, QColor('#8B0000'))
-            dark_palette.setColor(QPalette.WindowText, QColor('#8B0000'))
-            dark_palette.setColor(QPalette.Button, QColor('#37474f'))
-            dark_palette.setColor(QPalette.ButtonText, QColor('#8B0000'))
-            dark_palette.setColor(QPalette.Light, QColor('#263238'))
-            dark_palette.setColor(QPalette.Midlight, QColor('#263238'))
-            dark_palette.setColor(QPalette.Dark, QColor('#181c1f'))
-            dark_palette.setColor(QPalette.Mid, QColor('#263238'))
-            dark_palette.setColor(QPalette.AlternateBase, QColor('#21252b'))
-            msg_box.setPalette(dark_palette)
+            msg_box.setPalette(_dark_palette())
             if msg_box.exec_() == QMessageBox.No:
                 event.ignore(); return
         self.cancel_downloads()
-        if self.lister_thread and self.lister_thread.isRunning(): self.lister_thread.quit(); self.lister_thread.wait()
-        self.config_manager.save_settings()
+        if self.lister: self.lister.cancel(); DirectoryLister.pool().waitForDone(2000)
+        self._apply_pending_cfg(); self.config_manager.save_settings()
         logger.info("Application closing."); event.accept()
 
     def cancel_fetch(self):
-        if self.lister_thread:
-            self.lister_thread.cancel()
+        if self.lister:
+            self.lister.cancel()
         self.cancel_fetch_button.setEnabled(False)
         self.fetch_button.setEnabled(True)
         self.statusBar.showMessage("Fetch cancelled.")
 
     def update_downloads_tab(self):
         active, completed, failed, canceled = self.download_manager.get_downloads_by_status()
-        # Format for UI
+        # Format for UI, rebuilding a download's row only when its record changed since the last update
+        row_cache, self._row_cache = self._row_cache, {}
         def fmt(d):
-            return {
-                'file_name': os.path.basename(d['file_path']),
-                'status': d['status'],
-                'progress': d.get('progress', 0),
-                'size': format_bytes(d.get('size', 0)),
-                'file_path': d['file_path'],
-                'can_pause': d['status'] == 'Downloading',
-                'can_resume': d['status'] == 'Paused',
-                'can_cancel': d['status'] in ('Queued','Downloading','Paused'),
-            }
+            key = (d['status'], d.get('progress', 0), d.get('eta_seconds'), d.get('size', 0), d['file_path'])
+            entry = (d['url'], d.get('rel_path'))
+            cached = row_cache.get(entry)
+            if cached is None or cached[0] != key:
+                status = d['status']
+                cached = (key, DownloadRow(
+                    file_name=os.path.basename(d['file_path']),
+                    status=status,
+                    progress=d.get('progress', 0),
+                    size=format_bytes(d.get('size', 0)),
+                    file_path=d['file_path'],
+                    eta_seconds=d.get('eta_seconds'),
+                    can_pause=status == 'Downloading',
+                    can_resume=status == 'Paused',
+                    can_cancel=status in ('Queued','Downloading','Paused'),
+                ))
+            self._row_cache[entry] = cached
+            return cached[1]
         self.downloads_tab.update_downloads(
             [fmt(d) for d in active],
             [fmt(d) for d in completed],
@@ -550,17 +483,22 @@ class MainWindow(QMainWindow):
         dot = " ●" if active else ""
         self.tab_widget.setTabText(1, f"Downloads{dot}")
 
-    def _downloads_tab_action(self, row, action):
-        # Find the download by row in the current active list
+    def _active_url(self, row):
+        """URL of the download shown in a row of the active downloads table, or None."""
         active, _, _, _ = self.download_manager.get_downloads_by_status()
-        if 0 <= row < len(active):
-            url = active[row]['url']
-            if action == 'pause':
-                self.download_manager.pause_file(url)
-            elif action == 'resume':
-                self.download_manager.resume_file(url)
-            elif action == 'cancel':
-                self.download_manager.cancel_file(url)
+        return active[row]['url'] if 0 <= row < len(active) else None
+
+    def _pause_row(self, row):
+        url = self._active_url(row)
+        if url: self.download_manager.pause_file(url)
+
+    def _resume_row(self, row):
+        url = self._active_url(row)
+        if url: self.download_manager.resume_file(url)
+
+    def _cancel_row(self, row):
+        url = self._active_url(row)
+        if url: self.download_manager.cancel_file(url)
 
     def _downloads_tab_retry(self, row, tab):
         # Find the download by row in the failed/canceled list
@@ -572,108 +510,52 @@ class MainWindow(QMainWindow):
 
     def open_in_explorer(self, file_path):
         if os.path.exists(file_path):
-            if sys.platform.startswith('win'):
-                os.startfile(os.path.dirname(file_path))
-            elif sys.platform.startswith('darwin'):
-                subprocess.run(['open', '--', os.path.dirname(file_path)])
-            else:
-                subprocess.run(['xdg-open', os.path.dirname(file_path)])
+            # Qt hands the folder to the platform's file manager without blocking the UI on it
+            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.dirname(file_path)))
+
+    def _debounced_set(self, key, value):
+        self._pending_cfg[key] = value
+        self._cfg_timer.start()
+
+    def _apply_pending_cfg(self):
+        """Store the settings changed since the last debounce period."""
+        self._cfg_timer.stop()
+        pending, self._pending_cfg = self._pending_cfg, {}
+        for key, value in pending.items():
+            self.config_manager.set(key, value)
 
     def apply_theme(self, theme_name):
-        self.config_manager.set("theme_name", theme_name)
-        styles = {
-            "Colorful": '''
-                QMainWindow { background: #232946; }
-                QPushButton { border-radius: 8px; padding: 6px 16px; font-size: 14px; background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #2196F3, stop:1 #FF9800); color: #fff; font-weight: bold; }
-                QPushButton:pressed { background: #FF9800; color: #fff; }
-                QPushButton:hover { background: #4CAF50; color: #fff; }
-                QLineEdit { border: 1.5px solid #2196F3; border-radius: 8px; padding: 4px 8px; font-size: 14px; background: #393E6B; color: #fff; selection-background-color: #FF9800; selection-color: #232946; }
-                QLabel { font-size: 14px; color: #E0E0E0; }
-                QToolBar { background: #232946; border-bottom: 2px solid #2196F3; }
-                QStatusBar { background: #232946; border-top: 2px solid #2196F3; color: #fff; }
-                QTreeWidget { font-size: 14px; background: #393E6B; color: #fff; alternate-background-color: #232946; }
-                QTreeWidget::item:selected { background: #2196F3; color: #fff; }
-                QTreeWidget::item:hover { background: #FF9800; color: #fff; }
-                QHeaderView::section { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #2196F3, stop:1 #FF9800); color: #fff; border: none; font-weight: bold; }
-                QProgressBar { border-radius: 8px; background: #232946; color: #fff; text-align: center; }
-                QProgressBar::chunk { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #4CAF50, stop:1 #2196F3); border-radius: 8px; }
-                QTabWidget::pane { border: 2px solid #2196F3; background: #232946; }
-                QTabBar::tab { background: #393E6B; color: #fff; padding: 6px 16px; min-width: 80px; min-height: 28px; font-size: 13px; border-top-left-radius: 6px; border-top-right-radius: 6px; font-weight: bold; margin-right: 4px; }
-                QTabWidget::tab-bar { alignment: center; }
-                QTabBar::tab:selected { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #2196F3, stop:1 #FF9800); color: #fff; }
-                QTabBar::tab:hover { background: #FF9800; color: #fff; }
-            ''',
-            "Dark": '''
-                QMainWindow { background: #181818; }
-                QPushButton { border-radius: 8px; padding: 6px 16px; font-size: 14px; background: #232323; color: #fff; font-weight: bold; }
-                QPushButton:pressed { background: #333; color: #fff; }
-                QPushButton:hover { background: #444; color: #fff; }
-                QLineEdit { border: 1.5px solid #444; border-radius: 8px; padding: 4px 8px; font-size: 14px; background: #232323; color: #fff; selection-background-color: #2196F3; selection-color: #181818; }
-                QLabel { font-size: 14px; color: #fff; }
-                QToolBar, QStatusBar { background: #181818; color: #fff; }
-                QTreeWidget, QTabBar::tab, QTabWidget::pane { background: #232323; color: #fff; }
-                QTreeWidget::item:selected, QTabBar::tab:selected { background: #2196F3; color: #fff; }
-                QTreeWidget::item:hover, QTabBar::tab:hover { background: #FF9800; color: #fff; }
-                QHeaderView::section { background: #232323; color: #fff; border: none; font-weight: bold; }
-                QProgressBar { border-radius: 8px; background: #181818; color: #fff; text-align: center; }
-                QProgressBar::chunk { background: #2196F3; border-radius: 8px; }
-            ''',
-            "Light": '''
-                QMainWindow { background: #f5f5f5; }
-                QPushButton { border-radius: 8px; padding: 6px 16px; font-size: 14px; background: #2196F3; color: #fff; font-weight: bold; }
-                QPushButton:pressed { background: #1976D2; color: #fff; }
-                QPushButton:hover { background: #FF9800; color: #fff; }
-                QLineEdit { border: 1.5px solid #2196F3; border-radius: 8px; padding: 4px 8px; font-size: 14px; background: #fff; color: #232946; selection-background-color: #2196F3; selection-color: #fff; }
-                QLabel { font-size: 14px; color: #232946; }
-                QToolBar, QStatusBar { background: #e0e0e0; color: #232946; }
-                QTreeWidget, QTabBar::tab, QTabWidget::pane { background: #fff; color: #232946; }
-                QTreeWidget::item:selected, QTabBar::tab:selected { background: #2196F3; color: #fff; }
-                QTreeWidget::item:hover, QTabBar::tab:hover { background: #FF9800; color: #fff; }
-                QHeaderView::section { background: #2196F3; color: #fff; border: none; font-weight: bold; }
-                QProgressBar { border-radius: 8px; background: #e0e0e0; color: #232946; text-align: center; }
-                QProgressBar::chunk { background: #2196F3; border-radius: 8px; }
-            ''',
-            "Solarized": '''
-                QMainWindow { background: #002b36; }
-                QPushButton { border-radius: 8px; padding: 6px 16px; font-size: 14px; background: #268bd2; color: #fdf6e3; font-weight: bold; }
-                QPushButton:pressed { background: #b58900; color: #fdf6e3; }
-                QPushButton:hover { background: #2aa198; color: #fdf6e3; }
-                QLineEdit { border: 1.5px solid #268bd2; border-radius: 8px; padding: 4px 8px; font-size: 14px; background: #073642; color: #fdf6e3; selection-background-color: #b58900; selection-color: #002b36; }
-                QLabel { font-size: 14px; color: #fdf6e3; }
-                QToolBar, QStatusBar { background: #073642; color: #fdf6e3; }
-                QTreeWidget, QTabBar::tab, QTabWidget::pane { background: #073642; color: #fdf6e3; }
-                QTreeWidget::item:selected, QTabBar::tab:selected { background: #268bd2; color: #fdf6e3; }
-                QTreeWidget::item:hover, QTabBar::tab:hover { background: #b58900; color: #fdf6e3; }
-                QHeaderView::section { background: #268bd2; color: #fdf6e3; border: none; font-weight: bold; }
-                QProgressBar { border-radius: 8px; background: #002b36; color: #fdf6e3; text-align: center; }
-                QProgressBar::chunk { background: #2aa198; border-radius: 8px; }
-            ''',
-            "Classic": '''
-                QMainWindow { background: #ececec; }
-                QPushButton { border-radius: 8px; padding: 6px 16px; font-size: 14px; background: #d3d3d3; color: #232946; font-weight: bold; }
-                QPushButton:pressed { background: #b0b0b0; color: #232946; }
-                QPushButton:hover { background: #2196F3; color: #fff; }
-                QLineEdit { border: 1.5px solid #2196F3; border-radius: 8px; padding: 4px 8px; font-size: 14px; background: #fff; color: #232946; selection-background-color: #2196F3; selection-color: #fff; }
-                QLabel { font-size: 14px; color: #232946; }
-                QToolBar, QStatusBar { background: #ececec; color: #232946; }
-                QTreeWidget, QTabBar::tab, QTabWidget::pane { background: #fff; color: #232946; }
-                QTreeWidget::item:selected, QTabBar::tab:selected { background: #2196F3; color: #fff; }
-                QTreeWidget::item:hover, QTabBar::tab:hover { background: #FF9800; color: #fff; }
-                QHeaderView::section { background: #d3d3d3; color: #232946; border: none; font-weight: bold; }
-                QProgressBar { border-radius: 8px; background: #ececec; color: #232946; text-align: center; }
-                QProgressBar::chunk { background: #2196F3; border-radius: 8px; }
-            '''
-        }
-        self.setStyleSheet(styles.get(theme_name, styles["Colorful"]))
+        # Names arrive as new strings from the combo box; the interned copy matches the cache keys by identity
+        theme_name = sys.intern(theme_name)
+        if self.config_manager.get("theme_name") != theme_name:
+            self.config_manager.set("theme_name", theme_name)
+        qss = self._theme_qss(theme_name) or self._theme_qss("Colorful")
+        # Applied once for the whole application; Qt re-polishes every widget on each call,
+        # so the cached sheet last applied is not set again
+        if qss is not MainWindow._applied_qss:
+            QApplication.instance().setStyleSheet(qss)
+            MainWindow._applied_qss = qss
+
+    @classmethod
+    def _theme_qss(cls, theme_name):
+        """Stylesheet for a theme from resources/themes, read from disk once per theme."""
+        qss = cls._qss_cache.get(theme_name)
+        if qss is None:
+            try:
+                with open(os.path.join(THEMES_DIR, f"{theme_name.lower()}.qss"), encoding="utf-8") as f:
+                    qss = f.read()
+            except OSError as e:
+                logger.error(f"Could not load theme {theme_name}: {e}")
+                qss = ""
+            cls._qss_cache[theme_name] = qss
+        return qss
     
     def handle_browser_url_selected(self, url):
         """Handle URL selection from browser tab with proper validation."""
-        from core.url_utils import ensure_url_encoded, is_valid_ftp_url
-        
         # Validate and encode the URL
-        encoded_url = ensure_url_encoded(url)
+        encoded_url = canonicalize_url(url)
         
-        if encoded_url and is_valid_ftp_url(encoded_url):
+        if encoded_url:
             # Switch to downloader tab
             self.tab_widget.setCurrentIndex(0)
             
@@ -688,7 +570,7 @@ class MainWindow(QMainWindow):
         else:
             # Show error message
             self.statusBar.showMessage("Invalid URL received from browser", 5000)
-            logger.error(f"Invalid URL from browser: {url}")
+            logger.error("Invalid URL from browser: %s", url)
     
     def set_url_from_browser(self, url):
         """Set URL in downloader from browser (alternative method)."""
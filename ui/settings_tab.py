@@ -1,5 +1,9 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QPushButton, QComboBox
+from PyQt5.QtWidgets import QWidget, QFormLayout, QSpinBox, QPushButton, QComboBox
 from PyQt5.QtCore import pyqtSignal
+import sys
+
+# Theme names offered in the combo box; interned so theme lookups keyed by them compare by identity
+THEME_NAMES = tuple(sys.intern(name) for name in ("Colorful", "Dark", "Light", "Solarized", "Classic"))
 
 class SettingsTab(QWidget):
     # Signals to update config
@@ -13,36 +17,37 @@ class SettingsTab(QWidget):
         self.init_ui(concurrent, depth, theme_name)
 
     def init_ui(self, concurrent, depth, theme_name):
-        layout = QVBoxLayout(self)
+        # One form lays out every label/field pair, rather than a row layout per setting
+        layout = QFormLayout(self)
         # Concurrent downloads
-        hbox1 = QHBoxLayout()
-        hbox1.addWidget(QLabel("Concurrent Downloads:"))
         self.concurrent_spinbox = QSpinBox()
         self.concurrent_spinbox.setRange(1, 16)
         self.concurrent_spinbox.setValue(concurrent)
+        # Typed values are reported once, on Enter or focus-out, not after every digit
+        self.concurrent_spinbox.setKeyboardTracking(False)
         self.concurrent_spinbox.valueChanged.connect(self.concurrent_changed.emit)
-        hbox1.addWidget(self.concurrent_spinbox)
-        layout.addLayout(hbox1)
+        layout.addRow("Concurrent Downloads:", self.concurrent_spinbox)
         # Listing depth
-        hbox2 = QHBoxLayout()
-        hbox2.addWidget(QLabel("Listing Depth:"))
         self.depth_spinbox = QSpinBox()
         self.depth_spinbox.setRange(1, 10)
         self.depth_spinbox.setValue(depth)
+        self.depth_spinbox.setKeyboardTracking(False)
         self.depth_spinbox.valueChanged.connect(self.depth_changed.emit)
-        hbox2.addWidget(self.depth_spinbox)
-        layout.addLayout(hbox2)
+        layout.addRow("Listing Depth:", self.depth_spinbox)
         # Theme selector
-        hbox3 = QHBoxLayout()
-        hbox3.addWidget(QLabel("Theme:"))
         self.theme_combo = QComboBox()
-        self.theme_combo.addItems(["Colorful", "Dark", "Light", "Solarized", "Classic"])
+        self.theme_combo.addItems(THEME_NAMES)
         self.theme_combo.setCurrentText(theme_name)
-        self.theme_combo.currentTextChanged.connect(self.theme_changed.emit)
-        hbox3.addWidget(self.theme_combo)
-        layout.addLayout(hbox3)
+        self._last_theme = self.theme_combo.currentText()
+        self.theme_combo.currentTextChanged.connect(self._on_theme_changed)
+        layout.addRow("Theme:", self.theme_combo)
         # Log viewer
         self.log_btn = QPushButton("View Log")
         self.log_btn.clicked.connect(self.view_log.emit)
-        layout.addWidget(self.log_btn)
-        layout.addStretch() 
\ No newline at end of file
+        layout.addRow(self.log_btn)
+
+    def _on_theme_changed(self, name):
+        # Only a different theme is worth restyling the whole application for
+        if name != self._last_theme:
+            self._last_theme = name
+            self.theme_changed.emit(name)
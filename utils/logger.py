@@ -1,8 +1,19 @@
 # utils/logger.py
 # This module sets up centralized logging for the application.
 
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# The logger handed out by setup_logger; logging is configured only on the first call
+_LOGGER = None
+# Writes queued records to the log file and console on its own thread
+_LISTENER = None
+# The log file is rolled over at this size, keeping LOG_BACKUPS older files beside it
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
 
 def setup_logger(log_dir='logs', log_file='app.log'):
     """
@@ -10,20 +21,33 @@ def setup_logger(log_dir='logs', log_file='app.log'):
 
     The logger will write to both a file and the console.
     """
+    global _LOGGER, _LISTENER
+    if _LOGGER is not None:
+        return _LOGGER
     log_path = os.path.join(log_dir, log_file)
+    logger = logging.getLogger(__name__)
 
     # Configure the root logger
     # Use a flag to prevent adding handlers multiple times
     root_logger = logging.getLogger()
     if not root_logger.handlers:
+        # Log calls only format the record and queue it; the listener thread does the blocking
+        # writes, so logging from the GUI thread never waits on the disk or console
+        log_queue = queue.SimpleQueue()
+        # delay=True leaves the file unopened until the first record is written
+        file_handler = RotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                                           encoding='utf-8', delay=True)
+        _LISTENER = QueueListener(log_queue, file_handler, logging.StreamHandler())
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_path),
-                logging.StreamHandler()
-            ]
+            handlers=[QueueHandler(log_queue)]
         )
-        logging.getLogger(__name__).info("Logger initialized.")
+        _LISTENER.start()
+        # Stopping the listener writes out whatever is still queued
+        atexit.register(_LISTENER.stop)
+        # Below the INFO threshold, so setting up logging alone never creates the log file
+        logger.debug("Logger initialized.")
     
-    return logging.getLogger(__name__)
+    _LOGGER = logger
+    return logger